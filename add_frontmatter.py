@@ -5,15 +5,24 @@ This script re-fetches metadata from the Notion API and adds front matter
 to already-exported files in a specified directory.
 """
 
+import logging
 import os
 import re
 from pathlib import Path
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 from client_wrapper import create_client, NotionClientWrapper
-from hierarchy import build_full_hierarchy, PageNode
-from exporter import sanitize_filename
+from exporter import LOGGER_NAME, configure_logging, flush_log
+from hierarchy import build_full_hierarchy, extract_page_title, PageNode
+
+
+# Per-file progress goes through the exporter's buffered logger, shared
+# with the hierarchy builder so messages stay in order; see
+# exporter.configure_logging(). Logging is thread-safe, so worker threads
+# can use it directly.
+logger = logging.getLogger(f"{LOGGER_NAME}.add_frontmatter")
 
 
 @dataclass
@@ -30,68 +39,159 @@ def fetch_page_metadata(client: NotionClientWrapper, page_id: str) -> Optional[P
     try:
         page = client.get_page(page_id)
 
-        # Extract title from properties
-        title = "Untitled"
-        if "properties" in page:
-            for prop_value in page["properties"].values():
-                if prop_value.get("type") == "title":
-                    title_array = prop_value.get("title", [])
-                    if title_array:
-                        title = title_array[0].get("plain_text", "Untitled")
-                    break
-
         return PageMetadata(
             page_id=page_id,
-            title=title,
+            title=extract_page_title(page),
             created_time=page.get("created_time", "unknown"),
             last_edited_time=page.get("last_edited_time", "unknown")
         )
     except Exception as e:
-        print(f"  Warning: Could not fetch metadata for {page_id}: {e}")
+        logger.warning(f"  Warning: Could not fetch metadata for {page_id}: {e}")
         return None
 
 
-def build_path_to_metadata_map(
-    client: NotionClientWrapper,
+def collect_page_paths(
     node: PageNode,
-    base_path: Path,
-    mapping: Dict[Path, PageMetadata]
+    base_path: str,
+    pairs: List[Tuple[str, PageNode]]
 ) -> None:
     """
-    Recursively build a mapping from file paths to page metadata.
+    Recursively collect (file path, node) pairs from the hierarchy.
+
+    No API calls are made; paths are derived from the already-built tree.
+    Paths are built as plain strings since they're only used as keys.
 
     Args:
-        client: Notion client wrapper
         node: Current page node
         base_path: Current directory path
-        mapping: Dictionary to populate with path -> metadata
+        pairs: List to populate with (path, node) tuples
     """
-    # Fetch metadata for this page
-    metadata = fetch_page_metadata(client, node.page_id)
-    if not metadata:
-        return
-
     if node.children:
         # Has children: folder/index.md
-        folder_name = sanitize_filename(node.title)
-        folder_path = base_path / folder_name
-        file_path = folder_path / "index.md"
-        mapping[file_path] = metadata
+        folder_path = os.path.join(base_path, node.sanitized_title)
+        pairs.append((os.path.join(folder_path, "index.md"), node))
 
         # Recurse into children
         for child in node.children:
-            build_path_to_metadata_map(client, child, folder_path, mapping)
+            collect_page_paths(child, folder_path, pairs)
     else:
         # No children: single .md file
-        file_name = sanitize_filename(node.title) + ".md"
-        file_path = base_path / file_name
-        mapping[file_path] = metadata
+        file_name = node.sanitized_title + ".md"
+        pairs.append((os.path.join(base_path, file_name), node))
+
+
+def fetch_all_metadata(
+    client: NotionClientWrapper,
+    page_ids: List[str],
+    max_workers: int = 16
+) -> List[Optional[PageMetadata]]:
+    """
+    Fetch metadata for many pages concurrently.
+
+    Args:
+        client: Notion client wrapper
+        page_ids: Page IDs to fetch
+        max_workers: Maximum number of requests in flight
+
+    Returns:
+        List of metadata (or None on failure), in the same order as page_ids
+    """
+    if not page_ids:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            lambda page_id: fetch_page_metadata(client, page_id),
+            page_ids
+        ))
+
+
+def node_metadata(node: PageNode) -> Optional[PageMetadata]:
+    """
+    Get page metadata already recorded on a hierarchy node.
+
+    Args:
+        node: Page node built by build_full_hierarchy
+
+    Returns:
+        PageMetadata, or None if the node lacks timestamps
+    """
+    if node.created_time is None or node.last_edited_time is None:
+        return None
+
+    return PageMetadata(
+        page_id=node.page_id,
+        title=node.title,
+        created_time=node.created_time,
+        last_edited_time=node.last_edited_time
+    )
+
+
+def build_path_to_metadata_map(
+    client: NotionClientWrapper,
+    roots: List[PageNode],
+    base_path: Path
+) -> Dict[str, PageMetadata]:
+    """
+    Build a mapping from file paths to page metadata.
+
+    The hierarchy already holds each page's title and timestamps (it
+    retrieves every page while being built), so this is an in-memory walk.
+    Pages are only fetched from the API if their node lacks metadata.
+
+    Args:
+        client: Notion client wrapper
+        roots: Root page nodes
+        base_path: Export root directory
+
+    Returns:
+        Dictionary mapping file path (as a string) -> metadata
+    """
+    pairs: List[Tuple[str, PageNode]] = []
+    for root in roots:
+        collect_page_paths(root, str(base_path), pairs)
+
+    by_id: Dict[str, PageMetadata] = {}
+    for _, node in pairs:
+        metadata = node_metadata(node)
+        if metadata:
+            by_id[node.page_id] = metadata
+
+    # Fall back to the API for anything the hierarchy didn't record
+    missing = list(dict.fromkeys(
+        node.page_id for _, node in pairs if node.page_id not in by_id
+    ))
+    for metadata in fetch_all_metadata(client, missing):
+        if metadata:
+            by_id[metadata.page_id] = metadata
+
+    return {
+        file_path: by_id[node.page_id]
+        for file_path, node in pairs
+        if node.page_id in by_id
+    }
+
+
+# Export date recorded in front matter added by this script
+DEFAULT_EXPORT_DATE = "2025-11-03"
+
+# Opening line of a YAML front matter block
+FRONTMATTER_MARKER = '---\n'
 
+# Files at least this large are prepended in place instead of rewritten
+LARGE_FILE_THRESHOLD = 1024 * 1024
 
-def generate_frontmatter(metadata: PageMetadata, export_date: str = "2025-11-03") -> str:
+# Buffer size used when shifting file content in place
+PREPEND_CHUNK_SIZE = 64 * 1024
+
+# Translation table for escaping double quotes in titles
+_QUOTE_TABLE = str.maketrans({'"': '\\"'})
+
+
+def generate_frontmatter(metadata: PageMetadata, export_date: str = DEFAULT_EXPORT_DATE) -> str:
     """Generate YAML front matter string."""
     # Escape quotes in title
-    safe_title = metadata.title.replace('"', '\\"')
+    safe_title = metadata.title.translate(_QUOTE_TABLE)
 
     return f'''---
 title: "{safe_title}"
@@ -107,38 +207,184 @@ last_edited: {metadata.last_edited_time}
 
 def has_frontmatter(content: str) -> bool:
     """Check if content already has YAML front matter."""
-    return content.startswith('---\n')
+    return content.startswith(FRONTMATTER_MARKER)
 
 
-def add_frontmatter_to_file(file_path: Path, metadata: PageMetadata, dry_run: bool = False) -> bool:
+def _walk_md(root: str) -> Iterator[str]:
     """
-    Add front matter to a markdown file.
+    Yield paths of exported markdown files under a directory.
 
-    Returns True if file was modified, False otherwise.
+    Uses os.scandir directly so entries are filtered by name before any
+    Path objects are built. Symlinked directories are not followed, and
+    the export report is skipped since it isn't a page. Directories that
+    can't be read are skipped, as Path.rglob does.
+
+    Args:
+        root: Directory to walk
+
+    Yields:
+        Markdown file paths as strings
     """
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif (
+                    entry.name.endswith(".md")
+                    and entry.name != "export_report.md"
+                    and entry.is_file()
+                ):
+                    yield entry.path
+
+
+def file_has_frontmatter(file_path: Union[str, Path]) -> bool:
+    """Check if a file starts with YAML front matter, reading only its head."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            return f.read(len(FRONTMATTER_MARKER)) == FRONTMATTER_MARKER.encode()
+    except OSError:
+        return False
+
+
+def _pread_all(fd: int, size: int, offset: int) -> bytes:
+    """Read exactly size bytes at offset."""
+    data = os.pread(fd, size, offset)
+    if len(data) != size:
+        raise OSError(f"Short read at offset {offset}")
+    return data
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int) -> None:
+    """Write all of data at offset, continuing after short writes."""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def _is_plain_utf8(chunk: bytes) -> bool:
+    """Check that bytes are UTF-8 without carriage returns."""
+    if b"\r" in chunk:
+        return False
+    try:
+        chunk.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _unshift(fd: int, start: int, size: int, shift: int) -> None:
+    """Move content shifted by _prepend_in_place back, from start to the end."""
+    while start < size:
+        length = min(PREPEND_CHUNK_SIZE, size - start)
+        _pwrite_all(fd, _pread_all(fd, length, start + shift), start)
+        start += length
+    os.ftruncate(fd, size)
 
-        if has_frontmatter(content):
-            print(f"  Skipping (already has frontmatter): {file_path.name}")
+
+def _prepend_in_place(fd: int, prefix: bytes) -> bool:
+    """
+    Insert bytes at the start of a file using a fixed-size buffer.
+
+    Content is shifted towards the end of the file one chunk at a time,
+    starting from the last chunk, then the prefix is written at offset 0.
+    Each chunk is checked on the way: rewriting the file in text mode only
+    gives the same bytes if it is UTF-8 without carriage returns. If a
+    chunk isn't, the chunks already shifted are moved back.
+
+    Args:
+        fd: File descriptor open for reading and writing
+        prefix: Bytes to insert at the start
+
+    Returns:
+        True if the prefix was inserted, False if the file was left
+        unchanged because it needs rewriting in text mode
+
+    Raises:
+        OSError: If the file can't be read or written
+    """
+    shift = len(prefix)
+    size = os.fstat(fd).st_size
+    end = size
+
+    while end > 0:
+        start = max(0, end - PREPEND_CHUNK_SIZE)
+        chunk = _pread_all(fd, end - start, start)
+
+        # Start the chunk on a character boundary, so it decodes on its own.
+        # UTF-8 characters have at most 3 continuation bytes
+        skip = 0
+        while start > 0 and skip < 3 and chunk[skip] & 0xC0 == 0x80:
+            skip += 1
+        if skip:
+            start += skip
+            chunk = chunk[skip:]
+
+        if not _is_plain_utf8(chunk):
+            _unshift(fd, end, size, shift)
             return False
 
-        frontmatter = generate_frontmatter(metadata)
-        new_content = frontmatter + content
+        _pwrite_all(fd, chunk, start + shift)
+        end = start
 
-        if dry_run:
-            print(f"  [DRY RUN] Would add frontmatter to: {file_path}")
-            return True
+    _pwrite_all(fd, prefix, 0)
+    return True
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
 
-        print(f"  Added frontmatter: {file_path.name}")
+def add_frontmatter_to_file(
+    file_path: Path,
+    metadata: PageMetadata,
+    dry_run: bool = False
+) -> bool:
+    """
+    Add front matter to a markdown file.
+
+    Returns True if file was modified, False otherwise.
+    """
+    try:
+        # Read and rewrite through a single handle: one open/close per file
+        mode = 'r' if dry_run else 'r+'
+        with open(file_path, mode, encoding='utf-8') as f:
+            # Sniff the first line before reading the whole file
+            head = f.read(len(FRONTMATTER_MARKER))
+            if has_frontmatter(head):
+                logger.info(f"  Skipping (already has frontmatter): {file_path.name}")
+                return False
+
+            if dry_run:
+                logger.info(f"  [DRY RUN] Would add frontmatter to: {file_path}")
+                return True
+
+            frontmatter = generate_frontmatter(metadata)
+
+            # Shift large files in place rather than holding them in memory,
+            # unless text mode would change their newlines
+            shifted = (
+                hasattr(os, 'pwrite')
+                and os.linesep == "\n"
+                and os.fstat(f.fileno()).st_size >= LARGE_FILE_THRESHOLD
+                and _prepend_in_place(f.fileno(), frontmatter.encode('utf-8'))
+            )
+
+            if not shifted:
+                content = head + f.read()
+                f.seek(0)
+                f.write(frontmatter + content)
+                f.truncate()
+
+        logger.info(f"  Added frontmatter: {file_path.name}")
         return True
 
     except Exception as e:
-        print(f"  Error processing {file_path}: {e}")
+        logger.error(f"  Error processing {file_path}: {e}")
         return False
 
 
@@ -150,6 +396,9 @@ def add_frontmatter_to_directory(
     """
     Add front matter to all exported markdown files.
 
+    Progress is logged to stdout as by exporter.configure_logging(),
+    unless the caller has configured logging itself.
+
     Args:
         output_dir: Directory containing exported markdown files
         dry_run: If True, don't actually modify files
@@ -158,17 +407,33 @@ def add_frontmatter_to_directory(
     Returns:
         Dictionary with statistics
     """
+    configure_logging(logging.DEBUG if verbose else logging.INFO)
+
     output_path = Path(output_dir).expanduser()
 
     if not output_path.exists():
         print(f"Error: Directory not found: {output_path}")
         return {"error": 1}
 
+    md_files = list(_walk_md(str(output_path)))
+
+    # Cheap pre-pass: skip the Notion crawl if there's nothing to update.
+    # A directory without markdown files falls through to the normal run
+    if md_files and all(file_has_frontmatter(md_file) for md_file in md_files):
+        print("All files already have frontmatter")
+        return {
+            "files_found": len(md_files),
+            "files_updated": 0,
+            "files_skipped": len(md_files),
+            "files_not_matched": 0
+        }
+
     print("Connecting to Notion API...")
     client = create_client()
 
     print("Building page hierarchy from Notion...")
     roots = build_full_hierarchy(client)
+    flush_log()
 
     if not roots:
         print("No pages found in Notion.")
@@ -176,10 +441,9 @@ def add_frontmatter_to_directory(
 
     # Build mapping from file paths to metadata
     print("Fetching page metadata...")
-    path_to_metadata: Dict[Path, PageMetadata] = {}
-    for root in roots:
-        build_path_to_metadata_map(client, root, output_path, path_to_metadata)
+    path_to_metadata = build_path_to_metadata_map(client, roots, output_path)
 
+    flush_log()
     print(f"Found {len(path_to_metadata)} pages with metadata")
 
     # Process files
@@ -193,24 +457,34 @@ def add_frontmatter_to_directory(
     print(f"\nProcessing files in {output_path}...")
 
     # Walk all markdown files in output directory
-    for md_file in output_path.rglob("*.md"):
-        # Skip export_report.md
-        if md_file.name == "export_report.md":
-            continue
-
+    matched_files: List[Tuple[Path, PageMetadata]] = []
+    for md_file in md_files:
         stats["files_found"] += 1
 
-        if md_file in path_to_metadata:
-            metadata = path_to_metadata[md_file]
-            if add_frontmatter_to_file(md_file, metadata, dry_run):
-                stats["files_updated"] += 1
-            else:
-                stats["files_skipped"] += 1
+        metadata = path_to_metadata.get(md_file)
+        if metadata:
+            matched_files.append((Path(md_file), metadata))
         else:
             if verbose:
-                print(f"  Not matched: {md_file.relative_to(output_path)}")
+                logger.debug(f"  Not matched: {os.path.relpath(md_file, output_path)}")
             stats["files_not_matched"] += 1
 
+    # Rewrite matched files in parallel (I/O-bound, so threads help)
+    if matched_files:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda match: add_frontmatter_to_file(match[0], match[1], dry_run),
+                matched_files
+            )
+
+            for updated in results:
+                if updated:
+                    stats["files_updated"] += 1
+                else:
+                    stats["files_skipped"] += 1
+
+    flush_log()
     return stats
 
 
@@ -239,6 +513,9 @@ def main():
 
     args = parser.parse_args()
 
+    # Buffer per-file messages and write them to stdout in batches
+    configure_logging(logging.DEBUG if args.verbose else logging.INFO)
+
     stats = add_frontmatter_to_directory(
         args.directory,
         dry_run=args.dry_run,
@@ -5,12 +5,19 @@ This module provides a wrapper around the notion-client SDK with
 authentication handling and common operations.
 """
 
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional
 from notion_client import Client
 from notion_client.errors import APIResponseError
 import config
 
 
+# Retry settings for rate-limited (HTTP 429) requests
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0  # seconds, doubled after each attempt
+
+
 class NotionClientWrapper:
     """Wrapper for the Notion API client with convenience methods."""
 
@@ -31,6 +38,119 @@ class NotionClientWrapper:
         self.token = token
         self.client = Client(auth=token)
 
+        # In-process caches for objects fetched by ID
+        self._page_cache: Dict[str, dict] = {}
+        self._database_cache: Dict[str, dict] = {}
+        self._bot_info: Optional[dict] = None
+
+    def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        self.client.close()
+
+    def __enter__(self) -> "NotionClientWrapper":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _request(self, endpoint_fn: Callable[..., dict], *args, **kwargs) -> Any:
+        """
+        Call an SDK endpoint, backing off and retrying when rate limited.
+
+        Honors the Retry-After header when present, otherwise waits
+        exponentially longer between attempts.
+
+        Args:
+            endpoint_fn: SDK endpoint function
+            *args, **kwargs: Arguments passed to the endpoint
+
+        Returns:
+            The endpoint's response
+
+        Raises:
+            APIResponseError: If the request fails for another reason or
+                              is still rate limited after MAX_RETRIES
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return endpoint_fn(*args, **kwargs)
+            except APIResponseError as e:
+                if getattr(e, "status", None) != 429 or attempt == MAX_RETRIES:
+                    raise
+
+                delay = RETRY_BASE_DELAY * (2 ** attempt)
+                headers = getattr(e, "headers", None)
+                retry_after = headers.get("retry-after") if headers else None
+                if retry_after:
+                    try:
+                        delay = float(retry_after)
+                    except ValueError:
+                        pass
+
+                time.sleep(delay)
+
+    def _iter_paginated(
+        self,
+        endpoint_fn: Callable[..., dict],
+        **kwargs
+    ) -> Iterator[dict]:
+        """
+        Iterate over all results from a paginated Notion endpoint.
+
+        Notion cursors are serial, so pages cannot be fetched in parallel.
+        The first request is made on the calling thread; most listings fit
+        in one response and need nothing more. When there are more pages,
+        the request for the next cursor is submitted to a worker thread as
+        soon as a response arrives, overlapping the network round-trip with
+        processing of the current page. Only one page of results is held
+        at a time.
+
+        Args:
+            endpoint_fn: SDK endpoint function accepting start_cursor
+            **kwargs: Arguments passed to the endpoint on every call
+
+        Yields:
+            Result objects, in order
+
+        Raises:
+            APIResponseError: If any API request fails
+        """
+        response = self._request(endpoint_fn, start_cursor=None, **kwargs)
+        if not response.get("has_more", False):
+            yield from response.get("results", [])
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while response is not None:
+                future = None
+                if response.get("has_more", False):
+                    future = executor.submit(
+                        self._request,
+                        endpoint_fn,
+                        start_cursor=response.get("next_cursor"),
+                        **kwargs
+                    )
+
+                yield from response.get("results", [])
+
+                response = future.result() if future is not None else None
+
+    def _paginate(self, endpoint_fn: Callable[..., dict], **kwargs) -> list:
+        """
+        Collect all results from a paginated Notion endpoint.
+
+        Args:
+            endpoint_fn: SDK endpoint function accepting start_cursor
+            **kwargs: Arguments passed to the endpoint on every call
+
+        Returns:
+            List of result objects from all pages
+
+        Raises:
+            APIResponseError: If any API request fails
+        """
+        return list(self._iter_paginated(endpoint_fn, **kwargs))
+
     def test_connection(self) -> bool:
         """
         Test if the connection and authentication work.
@@ -40,7 +160,7 @@ class NotionClientWrapper:
         """
         try:
             # Try to list users as a simple authentication test
-            self.client.users.me()
+            self._request(self.client.users.me)
             return True
         except APIResponseError as e:
             print(f"API Error: {e}")
@@ -59,7 +179,9 @@ class NotionClientWrapper:
         Raises:
             APIResponseError: If API request fails
         """
-        return self.client.users.me()
+        if self._bot_info is None:
+            self._bot_info = self._request(self.client.users.me)
+        return self._bot_info
 
     def search_pages(self, query: str = "", page_size: int = 100) -> list:
         """
@@ -75,28 +197,38 @@ class NotionClientWrapper:
         Raises:
             APIResponseError: If API request fails
         """
-        results = []
-        has_more = True
-        start_cursor = None
+        return list(self.iter_search_pages(query, page_size))
+
+    def iter_search_pages(self, query: str = "", page_size: int = 100) -> Iterator[dict]:
+        """
+        Iterate over search results without loading them all.
 
-        while has_more:
-            response = self.client.search(
-                query=query,
-                page_size=page_size,
-                start_cursor=start_cursor,
-                filter={"property": "object", "value": "page"}
-            )
+        Only pages are returned; the object filter is applied server-side.
 
-            results.extend(response.get("results", []))
-            has_more = response.get("has_more", False)
-            start_cursor = response.get("next_cursor")
+        Args:
+            query: Optional search query (empty returns all accessible pages)
+            page_size: Number of results per page (max 100)
 
-        return results
+        Yields:
+            Page objects
+
+        Raises:
+            APIResponseError: If API request fails
+        """
+        return self._iter_paginated(
+            self.client.search,
+            query=query,
+            page_size=page_size,
+            filter={"property": "object", "value": "page"}
+        )
 
     def get_page(self, page_id: str) -> dict:
         """
         Retrieve a page by ID.
 
+        Results are cached for the lifetime of the wrapper; use
+        invalidate() to force a refetch.
+
         Args:
             page_id: The Notion page ID
 
@@ -106,7 +238,11 @@ class NotionClientWrapper:
         Raises:
             APIResponseError: If page not found or not accessible
         """
-        return self.client.pages.retrieve(page_id)
+        page = self._page_cache.get(page_id)
+        if page is None:
+            page = self._request(self.client.pages.retrieve, page_id)
+            self._page_cache[page_id] = page
+        return page
 
     def get_block_children(self, block_id: str, page_size: int = 100) -> list:
         """
@@ -122,27 +258,19 @@ class NotionClientWrapper:
         Raises:
             APIResponseError: If block not found or not accessible
         """
-        results = []
-        has_more = True
-        start_cursor = None
-
-        while has_more:
-            response = self.client.blocks.children.list(
-                block_id=block_id,
-                page_size=page_size,
-                start_cursor=start_cursor
-            )
-
-            results.extend(response.get("results", []))
-            has_more = response.get("has_more", False)
-            start_cursor = response.get("next_cursor")
-
-        return results
+        return self._paginate(
+            self.client.blocks.children.list,
+            block_id=block_id,
+            page_size=page_size
+        )
 
     def get_database(self, database_id: str) -> dict:
         """
         Retrieve a database by ID.
 
+        Results are cached for the lifetime of the wrapper; use
+        invalidate() to force a refetch.
+
         Args:
             database_id: The Notion database ID
 
@@ -152,7 +280,27 @@ class NotionClientWrapper:
         Raises:
             APIResponseError: If database not found or not accessible
         """
-        return self.client.databases.retrieve(database_id)
+        database = self._database_cache.get(database_id)
+        if database is None:
+            database = self._request(self.client.databases.retrieve, database_id)
+            self._database_cache[database_id] = database
+        return database
+
+    def invalidate(self, object_id: Optional[str] = None) -> None:
+        """
+        Drop cached page/database objects.
+
+        Args:
+            object_id: Page or database ID to drop. If None, clears all
+                       caches including bot info.
+        """
+        if object_id is None:
+            self._page_cache.clear()
+            self._database_cache.clear()
+            self._bot_info = None
+        else:
+            self._page_cache.pop(object_id, None)
+            self._database_cache.pop(object_id, None)
 
     def query_database(self, database_id: str, page_size: int = 100) -> list:
         """
@@ -168,22 +316,27 @@ class NotionClientWrapper:
         Raises:
             APIResponseError: If database not found or not accessible
         """
-        results = []
-        has_more = True
-        start_cursor = None
+        return list(self.iter_database(database_id, page_size))
 
-        while has_more:
-            response = self.client.databases.query(
-                database_id=database_id,
-                page_size=page_size,
-                start_cursor=start_cursor
-            )
+    def iter_database(self, database_id: str, page_size: int = 100) -> Iterator[dict]:
+        """
+        Iterate over entries in a database without loading them all.
 
-            results.extend(response.get("results", []))
-            has_more = response.get("has_more", False)
-            start_cursor = response.get("next_cursor")
+        Args:
+            database_id: The Notion database ID
+            page_size: Number of results per page (max 100)
+
+        Yields:
+            Page objects (database rows)
 
-        return results
+        Raises:
+            APIResponseError: If database not found or not accessible
+        """
+        return self._iter_paginated(
+            self.client.databases.query,
+            database_id=database_id,
+            page_size=page_size
+        )
 
 
 def create_client(token: Optional[str] = None) -> NotionClientWrapper:
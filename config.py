@@ -7,10 +7,23 @@ This module provides functionality to retrieve the Notion API token from:
 """
 
 import os
+import re
 from pathlib import Path
 from typing import Optional
 
 
+# Minimum plausible length of a Notion API token
+MIN_TOKEN_LENGTH = 20
+
+# KEY=VALUE lines (optionally prefixed by "export"); comments and blank
+# lines never match
+_ENV_LINE_RE = re.compile(
+    r"""^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"""
+    r"""(?:"(.*)"|'(.*)'|(.*?))[ \t\r]*$""",
+    re.MULTILINE
+)
+
+
 class ConfigError(Exception):
     """Raised when configuration is invalid or missing."""
     pass
@@ -26,37 +39,19 @@ def load_env_file(file_path: Path) -> dict:
     Returns:
         Dictionary of environment variables
     """
-    env_vars = {}
-
     if not file_path.exists():
-        return env_vars
+        return {}
 
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
-
-                # Parse KEY=VALUE format
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # Remove quotes if present
-                    if value.startswith('"') and value.endswith('"'):
-                        value = value[1:-1]
-                    elif value.startswith("'") and value.endswith("'"):
-                        value = value[1:-1]
-
-                    env_vars[key] = value
+        text = file_path.read_text()
     except Exception as e:
         raise ConfigError(f"Error reading {file_path}: {e}")
 
-    return env_vars
+    # Matching quotes around the value are stripped
+    return {
+        key: double_quoted or single_quoted or bare
+        for key, double_quoted, single_quoted, bare in _ENV_LINE_RE.findall(text)
+    }
 
 
 def get_notion_token() -> str:
@@ -105,27 +100,6 @@ def get_notion_token() -> str:
     )
 
 
-def validate_token(token: str) -> bool:
-    """
-    Validate that a token looks correct (basic format check).
-
-    Args:
-        token: The token to validate
-
-    Returns:
-        True if token appears valid, False otherwise
-    """
-    if not token:
-        return False
-
-    # Notion tokens are typically quite long
-    # Note: Don't check prefix as format may vary
-    if len(token) < 20:
-        return False
-
-    return True
-
-
 def get_validated_token() -> str:
     """
     Get and validate the Notion API token.
@@ -138,10 +112,12 @@ def get_validated_token() -> str:
     """
     token = get_notion_token()
 
-    if not validate_token(token):
+    # Notion tokens are typically quite long. Don't check the prefix:
+    # the format has changed over time (e.g. "secret_" vs "ntn_").
+    if len(token) < MIN_TOKEN_LENGTH:
         raise ConfigError(
             "The Notion token appears to be invalid.\n"
-            "Tokens should be at least 20 characters long.\n"
+            f"Tokens should be at least {MIN_TOKEN_LENGTH} characters long.\n"
             "Please check your token and try again."
         )
 
@@ -5,10 +5,192 @@ This module handles querying Notion databases and converting them to
 Markdown table format.
 """
 
-from typing import List, Dict, Any, Optional
+import io
+from typing import Any, Callable, Dict, List, Optional
 from client_wrapper import NotionClientWrapper
 
 
+def _extract_title(prop: Dict) -> str:
+    title_array = prop.get("title", [])
+    if title_array:
+        return title_array[0].get("plain_text", "")
+    return ""
+
+
+def _extract_rich_text(prop: Dict) -> str:
+    text_array = prop.get("rich_text", [])
+    if text_array:
+        return " ".join([t.get("plain_text", "") for t in text_array])
+    return ""
+
+
+def _extract_number(prop: Dict) -> str:
+    num = prop.get("number")
+    return str(num) if num is not None else ""
+
+
+def _extract_select(prop: Dict) -> str:
+    select = prop.get("select")
+    return select.get("name", "") if select else ""
+
+
+def _extract_multi_select(prop: Dict) -> str:
+    multi = prop.get("multi_select", [])
+    return ", ".join([s.get("name", "") for s in multi])
+
+
+def _extract_date(prop: Dict) -> str:
+    date = prop.get("date")
+    if date:
+        start = date.get("start", "")
+        end = date.get("end")
+        if end:
+            return f"{start} → {end}"
+        return start
+    return ""
+
+
+def _extract_people(prop: Dict) -> str:
+    people = prop.get("people", [])
+    names = []
+    for person in people:
+        name = person.get("name")
+        if name:
+            names.append(name)
+    return ", ".join(names)
+
+
+def _extract_checkbox(prop: Dict) -> str:
+    checked = prop.get("checkbox", False)
+    return "✓" if checked else ""
+
+
+def _extract_url(prop: Dict) -> str:
+    url = prop.get("url")
+    return url if url else ""
+
+
+def _extract_email(prop: Dict) -> str:
+    email = prop.get("email")
+    return email if email else ""
+
+
+def _extract_phone_number(prop: Dict) -> str:
+    phone = prop.get("phone_number")
+    return phone if phone else ""
+
+
+def _extract_status(prop: Dict) -> str:
+    status = prop.get("status")
+    return status.get("name", "") if status else ""
+
+
+def _extract_formula(prop: Dict) -> str:
+    formula = prop.get("formula", {})
+    formula_type = formula.get("type")
+    if formula_type == "string":
+        return formula.get("string", "")
+    elif formula_type == "number":
+        num = formula.get("number")
+        return str(num) if num is not None else ""
+    elif formula_type == "boolean":
+        return "Yes" if formula.get("boolean") else "No"
+    elif formula_type == "date":
+        date = formula.get("date", {})
+        return date.get("start", "")
+    return ""
+
+
+def _extract_relation(prop: Dict) -> str:
+    # Relations are complex, just show count
+    relations = prop.get("relation", [])
+    return f"{len(relations)} item(s)"
+
+
+def _extract_rollup(prop: Dict) -> str:
+    rollup = prop.get("rollup", {})
+    rollup_type = rollup.get("type")
+    if rollup_type == "number":
+        num = rollup.get("number")
+        return str(num) if num is not None else ""
+    elif rollup_type == "array":
+        array = rollup.get("array", [])
+        return f"{len(array)} item(s)"
+    return ""
+
+
+def _extract_created_time(prop: Dict) -> str:
+    return prop.get("created_time", "")
+
+
+def _extract_created_by(prop: Dict) -> str:
+    user = prop.get("created_by", {})
+    return user.get("name", "")
+
+
+def _extract_last_edited_time(prop: Dict) -> str:
+    return prop.get("last_edited_time", "")
+
+
+def _extract_last_edited_by(prop: Dict) -> str:
+    user = prop.get("last_edited_by", {})
+    return user.get("name", "")
+
+
+def _extract_files(prop: Dict) -> str:
+    files = prop.get("files", [])
+    if files:
+        names = []
+        for file in files:
+            name = file.get("name", "file")
+            names.append(name)
+        return ", ".join(names)
+    return ""
+
+
+# Property type -> function extracting a string value from the property
+_EXTRACTORS: Dict[str, Callable[[Dict], str]] = {
+    "title": _extract_title,
+    "rich_text": _extract_rich_text,
+    "number": _extract_number,
+    "select": _extract_select,
+    "multi_select": _extract_multi_select,
+    "date": _extract_date,
+    "people": _extract_people,
+    "checkbox": _extract_checkbox,
+    "url": _extract_url,
+    "email": _extract_email,
+    "phone_number": _extract_phone_number,
+    "status": _extract_status,
+    "formula": _extract_formula,
+    "relation": _extract_relation,
+    "rollup": _extract_rollup,
+    "created_time": _extract_created_time,
+    "created_by": _extract_created_by,
+    "last_edited_time": _extract_last_edited_time,
+    "last_edited_by": _extract_last_edited_by,
+    "files": _extract_files,
+}
+
+
+def get_property_extractor(prop_type: str) -> Callable[[Dict], str]:
+    """
+    Get the function that extracts string values for a property type.
+
+    Args:
+        prop_type: Property type
+
+    Returns:
+        Function taking a property object and returning its string value.
+        Unknown types yield a placeholder like "[type]".
+    """
+    extractor = _EXTRACTORS.get(prop_type)
+    if extractor is None:
+        placeholder = f"[{prop_type}]"
+        return lambda prop: placeholder
+    return extractor
+
+
 def extract_property_value(prop: Dict, prop_type: str) -> str:
     """
     Extract a simple string value from a Notion property.
@@ -21,131 +203,15 @@ def extract_property_value(prop: Dict, prop_type: str) -> str:
         String representation of the property value
     """
     try:
-        if prop_type == "title":
-            title_array = prop.get("title", [])
-            if title_array:
-                return title_array[0].get("plain_text", "")
-            return ""
-
-        elif prop_type == "rich_text":
-            text_array = prop.get("rich_text", [])
-            if text_array:
-                return " ".join([t.get("plain_text", "") for t in text_array])
-            return ""
-
-        elif prop_type == "number":
-            num = prop.get("number")
-            return str(num) if num is not None else ""
-
-        elif prop_type == "select":
-            select = prop.get("select")
-            return select.get("name", "") if select else ""
-
-        elif prop_type == "multi_select":
-            multi = prop.get("multi_select", [])
-            return ", ".join([s.get("name", "") for s in multi])
-
-        elif prop_type == "date":
-            date = prop.get("date")
-            if date:
-                start = date.get("start", "")
-                end = date.get("end")
-                if end:
-                    return f"{start} → {end}"
-                return start
-            return ""
-
-        elif prop_type == "people":
-            people = prop.get("people", [])
-            names = []
-            for person in people:
-                name = person.get("name")
-                if name:
-                    names.append(name)
-            return ", ".join(names)
-
-        elif prop_type == "checkbox":
-            checked = prop.get("checkbox", False)
-            return "✓" if checked else ""
-
-        elif prop_type == "url":
-            url = prop.get("url")
-            return url if url else ""
-
-        elif prop_type == "email":
-            email = prop.get("email")
-            return email if email else ""
-
-        elif prop_type == "phone_number":
-            phone = prop.get("phone_number")
-            return phone if phone else ""
-
-        elif prop_type == "status":
-            status = prop.get("status")
-            return status.get("name", "") if status else ""
-
-        elif prop_type == "formula":
-            formula = prop.get("formula", {})
-            formula_type = formula.get("type")
-            if formula_type == "string":
-                return formula.get("string", "")
-            elif formula_type == "number":
-                num = formula.get("number")
-                return str(num) if num is not None else ""
-            elif formula_type == "boolean":
-                return "Yes" if formula.get("boolean") else "No"
-            elif formula_type == "date":
-                date = formula.get("date", {})
-                return date.get("start", "")
-            return ""
-
-        elif prop_type == "relation":
-            # Relations are complex, just show count
-            relations = prop.get("relation", [])
-            return f"{len(relations)} item(s)"
-
-        elif prop_type == "rollup":
-            rollup = prop.get("rollup", {})
-            rollup_type = rollup.get("type")
-            if rollup_type == "number":
-                num = rollup.get("number")
-                return str(num) if num is not None else ""
-            elif rollup_type == "array":
-                array = rollup.get("array", [])
-                return f"{len(array)} item(s)"
-            return ""
-
-        elif prop_type == "created_time":
-            return prop.get("created_time", "")
-
-        elif prop_type == "created_by":
-            user = prop.get("created_by", {})
-            return user.get("name", "")
-
-        elif prop_type == "last_edited_time":
-            return prop.get("last_edited_time", "")
-
-        elif prop_type == "last_edited_by":
-            user = prop.get("last_edited_by", {})
-            return user.get("name", "")
-
-        elif prop_type == "files":
-            files = prop.get("files", [])
-            if files:
-                names = []
-                for file in files:
-                    name = file.get("name", "file")
-                    names.append(name)
-                return ", ".join(names)
-            return ""
-
-        else:
-            return f"[{prop_type}]"
-
+        return get_property_extractor(prop_type)(prop)
     except Exception as e:
         return f"[Error: {e}]"
 
 
+# Translation table for making property values safe inside a table cell
+_CELL_ESCAPE = str.maketrans({"|": "\\|", "\n": " "})
+
+
 def database_to_markdown_table(
     client: NotionClientWrapper,
     database_id: str,
@@ -179,48 +245,54 @@ def database_to_markdown_table(
         if not columns:
             return "_Empty database_"
 
-        # Query database for all rows
-        rows = client.query_database(database_id)
-
-        if max_rows:
-            rows = rows[:max_rows]
-
         # Build table
-        lines = []
+        buf = io.StringIO()
 
         # Header row
-        header = "| " + " | ".join(columns) + " |"
-        lines.append(header)
+        buf.write("| " + " | ".join(columns) + " |\n")
 
         # Separator row
-        separator = "|" + "|".join(["---"] * len(columns)) + "|"
-        lines.append(separator)
+        buf.write("|" + "|".join(["---"] * len(columns)) + "|")
+
+        # Resolve each column's extractor once, not once per cell
+        column_extractors = [
+            (col_name, get_property_extractor(column_types[col_name]))
+            for col_name in columns
+        ]
+
+        # Data rows, streamed from the database query
+        row_count = 0
+        for row in client.iter_database(database_id):
+            if max_rows and row_count >= max_rows:
+                break
+            row_count += 1
 
-        # Data rows
-        for row in rows:
             row_properties = row.get("properties", {})
             values = []
 
-            for col_name in columns:
-                if col_name in row_properties:
-                    prop = row_properties[col_name]
-                    prop_type = column_types[col_name]
-                    value = extract_property_value(prop, prop_type)
-                    # Escape pipes in values
-                    value = value.replace("|", "\\|")
-                    values.append(value)
-                else:
+            for col_name, extract in column_extractors:
+                prop = row_properties.get(col_name)
+                if prop is None:
                     values.append("")
+                    continue
+
+                try:
+                    value = extract(prop)
+                except Exception as e:
+                    value = f"[Error: {e}]"
+
+                # Escape pipes and flatten newlines so the cell stays on one row
+                values.append(value.translate(_CELL_ESCAPE))
 
-            row_line = "| " + " | ".join(values) + " |"
-            lines.append(row_line)
+            buf.write("\n| ")
+            buf.write(" | ".join(values))
+            buf.write(" |")
 
         # Add note if truncated
-        if max_rows and len(rows) == max_rows:
-            lines.append("")
-            lines.append(f"_Table truncated to {max_rows} rows_")
+        if max_rows and row_count == max_rows:
+            buf.write(f"\n\n_Table truncated to {max_rows} rows_")
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     except Exception as e:
         return f"_Error exporting database: {e}_"
@@ -5,15 +5,47 @@ This module handles file system operations including folder creation,
 filename sanitization, and markdown file writing.
 """
 
-import re
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import sqlite3
+import sys
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+)
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set
-from hierarchy import PageNode
-from markdown_converter import MarkdownConverter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from filenames import clear_filename_cache, sanitize_filename_default
+from hierarchy import PageNode, select_child_pages
+from markdown_converter import MarkdownConverter, UnsupportedFeature
 from client_wrapper import NotionClientWrapper
 
 
+# Progress and error messages go through a logger shared with hierarchy.py,
+# so they can be buffered instead of written to stdout one line at a time
+LOGGER_NAME = "notion_exporter"
+logger = logging.getLogger(LOGGER_NAME)
+
+# Page cache file, stored in the output directory
+CACHE_FILENAME = ".cache.sqlite"
+# Bumped when the pages table changes; older tables are rebuilt
+CACHE_SCHEMA_VERSION = 2
+# Number of cache writes grouped into one transaction
+CACHE_COMMIT_INTERVAL = 256
+
+# Page files are written in the background, this many threads at a time
+WRITE_WORKERS = 4
+# Maximum number of page writes in flight before waiting for them to finish
+WRITE_BATCH_SIZE = 64
+
+# Pages with fewer blocks are converted in-process even when conversion
+# workers are enabled, as pickling them would cost more than it saves
+MIN_BLOCKS_PER_WORKER_PAGE = 64
+
+
 def generate_frontmatter(node: PageNode) -> str:
     """
     Generate YAML front matter for a page.
@@ -45,6 +77,271 @@ def generate_frontmatter(node: PageNode) -> str:
     return "\n".join(lines)
 
 
+def iter_nodes(roots: List[PageNode]) -> Iterator[PageNode]:
+    """
+    Iterate over all nodes of a hierarchy in depth-first (export) order.
+
+    Args:
+        roots: List of root PageNodes
+
+    Yields:
+        Each PageNode, parents before their children
+    """
+    stack = list(reversed(roots))
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.children))
+
+
+class PageCache:
+    """
+    SQLite-backed cache of converted page markdown.
+
+    Entries are keyed by page ID and the converter options, and are valid
+    while the page's last_edited_time is unchanged, so unchanged pages can be exported
+    without fetching or converting their blocks. A hash of the fetched
+    blocks also lets an edited page skip conversion when its blocks
+    turn out to be identical.
+
+    It also remembers each page's child pages, so that discovery can skip
+    fetching the blocks of pages that haven't changed.
+
+    Writes are committed in batches and on close(). If the database fails
+    (e.g. it is locked or corrupt), a warning is logged and the cache
+    disables itself: lookups miss and writes are dropped, so the export
+    carries on uncached.
+    """
+
+    def __init__(self, path: Path, options: str = ""):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite database file
+            options: Converter options the cached markdown depends on;
+                     entries converted with other options are ignored
+
+        Raises:
+            sqlite3.Error: If the database can't be opened
+        """
+        self.options = options
+        self.enabled = True
+        self._uncommitted = 0
+
+        self.connection = sqlite3.connect(str(path))
+        try:
+            self._create_tables()
+        except sqlite3.Error:
+            self.connection.close()
+            raise
+
+    def _create_tables(self) -> None:
+        """Set up the schema, rebuilding tables from older versions."""
+        self.connection.execute("PRAGMA journal_mode=WAL")
+
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_SCHEMA_VERSION:
+            # Entries from older versions weren't keyed by options
+            self.connection.execute("DROP TABLE IF EXISTS pages")
+            self.connection.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "page_id TEXT PRIMARY KEY, "
+            "last_edited_time TEXT, "
+            "blocks_hash TEXT, "
+            "options TEXT NOT NULL, "
+            "markdown TEXT NOT NULL, "
+            "unsupported TEXT NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS child_pages ("
+            "page_id TEXT PRIMARY KEY, "
+            "last_edited_time TEXT NOT NULL, "
+            "blocks TEXT NOT NULL)"
+        )
+        self.connection.commit()
+
+    def get(self, page_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached entry for a page.
+
+        Args:
+            page_id: Notion page ID
+
+        Returns:
+            Dictionary with last_edited_time, blocks_hash, markdown and
+            unsupported (list of UnsupportedFeature), or None if not cached
+            with the current options
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            row = self.connection.execute(
+                "SELECT last_edited_time, blocks_hash, markdown, unsupported "
+                "FROM pages WHERE page_id = ? AND options = ?",
+                (page_id, self.options)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            return {
+                "last_edited_time": row[0],
+                "blocks_hash": row[1],
+                "markdown": row[2],
+                "unsupported": [
+                    UnsupportedFeature(*feature) for feature in json.loads(row[3])
+                ],
+            }
+        except (sqlite3.Error, ValueError) as e:
+            self._disable(e)
+            return None
+
+    def put(
+        self,
+        page_id: str,
+        last_edited_time: Optional[str],
+        blocks_hash: str,
+        markdown: str,
+        unsupported: List[UnsupportedFeature]
+    ) -> None:
+        """
+        Store the converted markdown for a page.
+
+        Args:
+            page_id: Notion page ID
+            last_edited_time: Page's last_edited_time when fetched
+            blocks_hash: Hash of the page's blocks (see hash_blocks)
+            markdown: Converted markdown
+            unsupported: Unsupported features found in the page
+        """
+        features = [[f.block_type, f.feature, f.block_id] for f in unsupported]
+        self._write(
+            "INSERT OR REPLACE INTO pages "
+            "(page_id, last_edited_time, blocks_hash, options, markdown, unsupported) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (page_id, last_edited_time, blocks_hash, self.options, markdown,
+             json.dumps(features))
+        )
+
+    def get_child_pages(
+        self,
+        page_id: str,
+        last_edited_time: Optional[str]
+    ) -> Optional[List[Dict]]:
+        """
+        Look up a page's child page blocks, if still up to date.
+
+        Args:
+            page_id: Notion page ID
+            last_edited_time: Page's current last_edited_time
+
+        Returns:
+            List of child page blocks, or None if not cached or the page
+            has been edited since
+        """
+        if last_edited_time is None or not self.enabled:
+            return None
+
+        try:
+            row = self.connection.execute(
+                "SELECT blocks FROM child_pages "
+                "WHERE page_id = ? AND last_edited_time = ?",
+                (page_id, last_edited_time)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            self._disable(e)
+            return None
+
+    def put_child_pages(
+        self,
+        page_id: str,
+        last_edited_time: str,
+        blocks: List[Dict]
+    ) -> None:
+        """
+        Store a page's child page blocks.
+
+        Args:
+            page_id: Notion page ID
+            last_edited_time: Page's last_edited_time when fetched
+            blocks: The page's child page blocks
+        """
+        self._write(
+            "INSERT OR REPLACE INTO child_pages "
+            "(page_id, last_edited_time, blocks) VALUES (?, ?, ?)",
+            (page_id, last_edited_time, json.dumps(blocks))
+        )
+
+    def _write(self, sql: str, parameters: Tuple) -> None:
+        """Execute a write statement, committing once enough have queued up."""
+        if not self.enabled:
+            return
+
+        try:
+            self.connection.execute(sql, parameters)
+        except sqlite3.Error as e:
+            self._disable(e)
+            return
+
+        self._uncommitted += 1
+        if self._uncommitted >= CACHE_COMMIT_INTERVAL:
+            self.commit()
+
+    def commit(self) -> None:
+        """Commit pending writes."""
+        if not self.enabled or not self._uncommitted:
+            return
+
+        try:
+            self.connection.commit()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return
+        self._uncommitted = 0
+
+    def _disable(self, error: Exception) -> None:
+        """Stop using the cache after a database error."""
+        logger.warning(f"Warning: Page cache failed, continuing without it: {error}")
+        self.enabled = False
+        try:
+            self.connection.close()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """Commit pending writes and close the underlying database connection."""
+        if not self.enabled:
+            return
+
+        self.commit()
+        if self.enabled:
+            self.enabled = False
+            self.connection.close()
+
+
+def hash_blocks(blocks: List[Dict]) -> str:
+    """
+    Compute a stable hash of a page's block list.
+
+    Args:
+        blocks: List of Notion block objects
+
+    Returns:
+        Hex digest of the serialized blocks
+    """
+    serialized = json.dumps(blocks, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(serialized.encode("utf-8"), digest_size=16).hexdigest()
+
+
 class ExportStats:
     """Statistics about the export process."""
 
@@ -70,63 +367,125 @@ class ExportStats:
         )
 
 
-def sanitize_filename(name: str, max_length: int = 200) -> str:
+def make_unique_filename(
+    base_path: Path,
+    name: str,
+    extension: str = ".md",
+    existing: Optional[Set[str]] = None
+) -> Path:
     """
-    Sanitize a string to be used as a filename.
+    Generate a unique filename by appending numbers if necessary.
 
     Args:
-        name: The original name
-        max_length: Maximum filename length
+        base_path: Directory where file will be created
+        name: Base filename (without extension)
+        extension: File extension
+        existing: Optional set of names already in base_path. When given,
+                  it is probed instead of the filesystem and the chosen
+                  name is added to it.
 
     Returns:
-        Sanitized filename
+        Unique Path object
     """
-    # Replace or remove invalid characters
-    # Invalid: / \ : * ? " < > |
-    sanitized = re.sub(r'[/\\:*?"<>|]', '_', name)
+    sanitized = sanitize_filename_default(name)
 
-    # Remove leading/trailing whitespace and dots
-    sanitized = sanitized.strip('. ')
+    if existing is None:
+        path = base_path / f"{sanitized}{extension}"
 
-    # Replace multiple spaces with single space
-    sanitized = re.sub(r'\s+', ' ', sanitized)
+        if not path.exists():
+            return path
 
-    # Truncate to max length
-    if len(sanitized) > max_length:
-        sanitized = sanitized[:max_length].rstrip('. ')
+        # File exists, append number
+        counter = 1
+        while True:
+            path = base_path / f"{sanitized}_{counter}{extension}"
+            if not path.exists():
+                return path
+            counter += 1
 
-    # Ensure it's not empty
-    if not sanitized:
-        sanitized = "Untitled"
+    return base_path / _claim_unique_name(sanitized, extension, existing)
 
-    return sanitized
 
+def _claim_unique_name(sanitized: str, extension: str, existing: Set[str]) -> str:
+    """Pick the first free name like make_unique_filename and add it to existing."""
+    filename = f"{sanitized}{extension}"
+    counter = 1
+    while filename in existing:
+        filename = f"{sanitized}_{counter}{extension}"
+        counter += 1
 
-def make_unique_filename(base_path: Path, name: str, extension: str = ".md") -> Path:
+    existing.add(filename)
+    return filename
+
+
+def configure_logging(level: int = logging.INFO, capacity: int = 1024) -> None:
     """
-    Generate a unique filename by appending numbers if necessary.
+    Send export progress messages to stdout through a buffer.
 
-    Args:
-        base_path: Directory where file will be created
-        name: Base filename (without extension)
-        extension: File extension
+    Messages are written in batches of capacity, and immediately on errors.
+    Does nothing if the logger already has handlers (including ones the
+    application set up on the root logger), so it is safe to call again.
 
-    Returns:
-        Unique Path object
+    Args:
+        level: Lowest level shown; logging.DEBUG adds per-page progress
+        capacity: Number of messages buffered before they are written
     """
-    sanitized = sanitize_filename(name)
-    path = base_path / f"{sanitized}{extension}"
+    if logger.hasHandlers():
+        return
 
-    if not path.exists():
-        return path
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(logging.handlers.MemoryHandler(
+        capacity, flushLevel=logging.ERROR, target=stream_handler
+    ))
+    logger.setLevel(level)
 
-    # File exists, append number
-    counter = 1
-    while True:
-        path = base_path / f"{sanitized}_{counter}{extension}"
-        if not path.exists():
-            return path
-        counter += 1
+
+def flush_log() -> None:
+    """Write out buffered log messages (before printing to stdout directly)."""
+    for handler in logger.handlers:
+        handler.flush()
+
+
+def _convert_worker(
+    blocks: List[Dict],
+    track_skipped_databases: bool
+) -> Tuple[str, List[UnsupportedFeature]]:
+    """Convert one page's blocks in a worker process."""
+    converter = MarkdownConverter(track_skipped_databases=track_skipped_databases)
+    markdown = converter.convert_blocks(blocks)
+    return markdown, converter.unsupported_features
+
+
+def _write_text(path: Path, chunks: Iterable[str]) -> None:
+    """
+    Write successive chunks of content to a UTF-8 text file.
+
+    Newlines are translated to the platform's line separator, as writing
+    through a text-mode file would.
+    """
+    if os.linesep != "\n":
+        chunks = [chunk.replace("\n", os.linesep) for chunk in chunks]
+    data = [chunk.encode('utf-8') for chunk in chunks]
+
+    if not hasattr(os, "writev"):
+        # No vectored writes (e.g. Windows)
+        with open(path, 'wb') as f:
+            f.writelines(data)
+        return
+
+    # Hand all chunks to the kernel in one call, bypassing Python's buffering
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        written = os.writev(fd, data)
+        total = sum(len(chunk) for chunk in data)
+        if written < total:
+            # Short write: finish the remainder
+            remainder = memoryview(b"".join(data))[written:]
+            while remainder:
+                remainder = remainder[os.write(fd, remainder):]
+    finally:
+        os.close(fd)
 
 
 class Exporter:
@@ -135,9 +494,10 @@ class Exporter:
     def __init__(
         self,
         client: NotionClientWrapper,
-        output_dir: Path,
+        output_dir: Union[str, Path],
         dry_run: bool = False,
-        include_databases: bool = False
+        include_databases: bool = False,
+        use_cache: bool = True
     ):
         """
         Initialize the exporter.
@@ -147,6 +507,8 @@ class Exporter:
             output_dir: Root directory for export
             dry_run: If True, don't actually create files
             include_databases: If True, export databases (and don't report them as unsupported)
+            use_cache: If True, reuse markdown of unchanged pages from
+                       the cache in the output directory
         """
         self.client = client
         self.output_dir = Path(output_dir)
@@ -155,33 +517,177 @@ class Exporter:
         # Track skipped databases only when NOT including them
         self.converter = MarkdownConverter(track_skipped_databases=not include_databases)
         self.stats = ExportStats()
-        self.used_paths: Set[str] = set()
+        # page_id -> pending get_block_children call, see export_hierarchy
+        self._block_futures: Dict[str, Future] = {}
+        # page_id -> pending conversion in a worker process
+        self._conversion_futures: Dict[str, Future] = {}
+        # directory -> names of its entries, see _dir_entries
+        self._dir_cache: Dict[str, Set[str]] = {}
+        # Background page writes, see _write_page
+        self._write_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: List[Tuple[Future, str, str, str]] = []
+        # Paths with a write in _pending_writes
+        self._pending_paths: Set[str] = set()
+        self.use_cache = use_cache
+        self.cache: Optional[PageCache] = None
+
+    def _get_fresh_cache_entry(
+        self,
+        page_id: str,
+        last_edited_time: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cache entry for a page if it is still up to date."""
+        if self.cache is None or last_edited_time is None:
+            return None
 
-    def export_page_content(self, page_id: str) -> Optional[str]:
+        entry = self.cache.get(page_id)
+        if entry and entry["last_edited_time"] == last_edited_time:
+            return entry
+        return None
+
+    def export_page_content(self, node: PageNode) -> Optional[str]:
         """
         Export the content of a single page as markdown.
 
+        Blocks fetched while building the hierarchy are used (and released
+        from the node) when available, so the page isn't fetched twice.
+
         Args:
-            page_id: Notion page ID
+            node: PageNode of the page; its last_edited_time is used to
+                  validate the cache
 
         Returns:
             Markdown string or None if error
         """
-        try:
-            # Get all blocks for this page
-            blocks = self.client.get_block_children(page_id)
+        page_id = node.page_id
+        last_edited_time = node.last_edited_time
+        blocks = node.blocks
+        node.blocks = None
 
-            # Convert to markdown
-            markdown = self.converter.convert_blocks(blocks)
+        try:
+            if blocks is not None:
+                self._remember_child_pages(page_id, last_edited_time, blocks)
+
+            entry = self._get_fresh_cache_entry(page_id, last_edited_time)
+            if entry:
+                self.converter.unsupported_features.extend(entry["unsupported"])
+                return entry["markdown"]
+
+            if blocks is None:
+                # Get all blocks for this page (prefetched if available)
+                future = self._block_futures.pop(page_id, None)
+                if future is not None:
+                    blocks = future.result()
+                else:
+                    blocks = self.client.get_block_children(page_id)
+                self._remember_child_pages(page_id, last_edited_time, blocks)
+
+            if self.cache is None or not self.cache.enabled:
+                return self._convert_page(page_id, blocks)[0]
+
+            # Blocks may be unchanged even if the page was touched
+            blocks_hash = hash_blocks(blocks)
+            entry = self.cache.get(page_id)
+            if entry and entry["blocks_hash"] == blocks_hash:
+                markdown = entry["markdown"]
+                unsupported = entry["unsupported"]
+                self.converter.unsupported_features.extend(unsupported)
+            else:
+                markdown, unsupported = self._convert_page(page_id, blocks)
+
+            self.cache.put(page_id, last_edited_time, blocks_hash, markdown, unsupported)
 
             return markdown
 
         except Exception as e:
             self.stats.add_error(page_id, str(e))
-            print(f"Error exporting page {page_id}: {e}")
+            logger.error(f"Error exporting page {page_id}: {e}")
             return None
 
-    def create_directory(self, path: Path) -> bool:
+    def _remember_child_pages(
+        self,
+        page_id: str,
+        last_edited_time: Optional[str],
+        blocks: List[Dict]
+    ) -> None:
+        """Record a page's child pages in the cache for the next discovery."""
+        if self.cache is None or last_edited_time is None:
+            return
+        self.cache.put_child_pages(
+            page_id, last_edited_time, select_child_pages(blocks)
+        )
+
+    def _convert_page(
+        self,
+        page_id: str,
+        blocks: List[Dict]
+    ) -> Tuple[str, List[UnsupportedFeature]]:
+        """
+        Convert a page's blocks to markdown.
+
+        Uses the result of a worker process if the page was handed to one.
+
+        Args:
+            page_id: Notion page ID
+            blocks: The page's blocks
+
+        Returns:
+            Tuple of (markdown, unsupported features found in this page)
+        """
+        future = self._conversion_futures.pop(page_id, None)
+        if future is not None:
+            markdown, unsupported = future.result()
+            self.converter.unsupported_features.extend(unsupported)
+            return markdown, unsupported
+
+        # Convert to markdown, noting this page's unsupported features
+        first_feature = len(self.converter.unsupported_features)
+        markdown = self.converter.convert_blocks(blocks)
+        return markdown, self.converter.unsupported_features[first_feature:]
+
+    def _submit_conversions(self, roots: List[PageNode], executor: Executor) -> None:
+        """Hand large pages whose blocks are already known to worker processes."""
+        for node in iter_nodes(roots):
+            if node.blocks is None or len(node.blocks) < MIN_BLOCKS_PER_WORKER_PAGE:
+                continue
+            if self._get_fresh_cache_entry(node.page_id, node.last_edited_time):
+                continue
+            self._conversion_futures[node.page_id] = executor.submit(
+                _convert_worker, node.blocks,
+                self.converter.track_skipped_databases
+            )
+
+    def _dir_entries(self, path: str) -> Set[str]:
+        """
+        Get the names of the entries in a directory, listing it only once.
+
+        The returned set is kept up to date as the exporter writes files and
+        creates directories, so it can be probed instead of the filesystem.
+
+        Args:
+            path: Directory path
+
+        Returns:
+            Set of entry names (empty if the directory doesn't exist)
+        """
+        names = self._dir_cache.get(path)
+        if names is None:
+            try:
+                with os.scandir(path) as entries:
+                    names = {entry.name for entry in entries}
+            except OSError:
+                names = set()
+            self._dir_cache[path] = names
+        return names
+
+    def _record_entry(self, path: Union[str, Path]) -> None:
+        """Add a newly created path to its parent's cached listing, if any."""
+        parent, name = os.path.split(os.fspath(path))
+        names = self._dir_cache.get(parent)
+        if names is not None:
+            names.add(name)
+
+    def create_directory(self, path: Union[str, Path]) -> bool:
         """
         Create a directory if it doesn't exist.
 
@@ -192,51 +698,123 @@ class Exporter:
             True if created or exists, False on error
         """
         if self.dry_run:
-            print(f"[DRY RUN] Would create directory: {path}")
+            logger.info(f"[DRY RUN] Would create directory: {path}")
             return True
 
         try:
-            path.mkdir(parents=True, exist_ok=True)
-            if str(path) not in self.used_paths:
+            try:
+                os.makedirs(path)
                 self.stats.folders_created += 1
-                self.used_paths.add(str(path))
+            except FileExistsError:
+                if not os.path.isdir(path):
+                    raise
+            self._record_entry(path)
             return True
         except Exception as e:
-            print(f"Error creating directory {path}: {e}")
+            logger.error(f"Error creating directory {path}: {e}")
             return False
 
-    def write_file(self, path: Path, content: str) -> bool:
+    def write_file(self, path: Union[str, Path], content: str, *more: str) -> bool:
         """
         Write content to a file.
 
         Args:
             path: File path
             content: File content
+            *more: Further content written after it, saving callers from
+                   concatenating large strings first
 
         Returns:
             True if successful, False otherwise
         """
         if self.dry_run:
-            print(f"[DRY RUN] Would write file: {path}")
+            logger.info(f"[DRY RUN] Would write file: {path}")
             return True
 
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            _write_text(path, (content,) + more)
+            self._record_entry(path)
             self.stats.files_created += 1
             return True
         except Exception as e:
-            print(f"Error writing file {path}: {e}")
+            logger.error(f"Error writing file {path}: {e}")
             return False
 
-    def export_node(
+    def _write_page(
+        self,
+        page_id: str,
+        path: str,
+        frontmatter: str,
+        content: str,
+        error_message: str,
+        background: bool = True
+    ) -> bool:
+        """
+        Write a page's file and account for it in the stats.
+
+        During export_hierarchy the write is handed to a background thread
+        so disk I/O overlaps with fetching and converting the next pages;
+        its outcome is recorded when the batch is flushed. A write waits
+        for any queued write to the same path, so the last one wins as it
+        would if they were written in order.
+
+        Args:
+            page_id: ID of the page being written
+            path: File path
+            frontmatter: Front matter written before the content
+            content: Page markdown
+            error_message: Error recorded for the page if the write fails
+            background: If False, write now even during export_hierarchy,
+                        for pages whose children depend on the outcome
+
+        Returns:
+            True if the write succeeded or was queued, False otherwise
+        """
+        if path in self._pending_paths:
+            self._flush_writes()
+
+        if not background or self._write_executor is None or self.dry_run:
+            if not self.write_file(path, frontmatter, content):
+                self.stats.add_error(page_id, error_message)
+                return False
+            self.stats.pages_exported += 1
+            return True
+
+        future = self._write_executor.submit(
+            _write_text, path, (frontmatter, content)
+        )
+        self._record_entry(path)
+        self._pending_writes.append((future, path, page_id, error_message))
+        self._pending_paths.add(path)
+
+        if len(self._pending_writes) >= WRITE_BATCH_SIZE:
+            self._flush_writes()
+
+        return True
+
+    def _flush_writes(self) -> None:
+        """Wait for queued page writes and record their results."""
+        for future, path, page_id, error_message in self._pending_writes:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error writing file {path}: {e}")
+                self.stats.add_error(page_id, error_message)
+                continue
+            self.stats.files_created += 1
+            self.stats.pages_exported += 1
+
+        self._pending_writes.clear()
+        self._pending_paths.clear()
+
+    def _export_single_node(
         self,
         node: PageNode,
-        parent_path: Path,
+        parent_path: str,
         verbose: bool = False
     ) -> bool:
         """
-        Export a page node and its children recursively.
+        Export one page node (without its children).
 
         Args:
             node: PageNode to export
@@ -247,76 +825,177 @@ class Exporter:
             True if successful, False otherwise
         """
         if verbose:
-            print(f"Exporting: {node.title}")
+            logger.debug(f"Exporting: {node.title}")
 
         # Get page content
-        content = self.export_page_content(node.page_id)
+        content = self.export_page_content(node)
 
         if content is None:
             return False
 
-        # Prepend front matter
+        # Front matter is written ahead of the content, without joining them
         frontmatter = generate_frontmatter(node)
-        content = frontmatter + content
 
         # Determine file structure based on children
         if node.children:
             # Has children: create folder with index.md
-            folder_name = sanitize_filename(node.title)
-            folder_path = parent_path / folder_name
+            folder_path = os.path.join(parent_path, node.sanitized_title)
 
             # Create folder
             if not self.create_directory(folder_path):
                 self.stats.add_error(node.page_id, "Failed to create directory")
                 return False
 
-            # Write index.md
-            index_path = folder_path / "index.md"
-            if not self.write_file(index_path, content):
-                self.stats.add_error(node.page_id, "Failed to write index.md")
-                return False
-
-            self.stats.pages_exported += 1
-
-            # Export children
-            for child in node.children:
-                self.export_node(child, folder_path, verbose)
+            # Write index.md now: its children are only exported if it
+            # succeeds
+            index_path = os.path.join(folder_path, "index.md")
+            return self._write_page(
+                node.page_id, index_path, frontmatter, content,
+                "Failed to write index.md", background=False
+            )
 
         else:
             # No children: create single .md file
-            file_path = make_unique_filename(parent_path, node.title, ".md")
+            filename = _claim_unique_name(
+                node.sanitized_title, ".md", self._dir_entries(parent_path)
+            )
+            file_path = os.path.join(parent_path, filename)
+            return self._write_page(
+                node.page_id, file_path, frontmatter, content,
+                "Failed to write file"
+            )
 
-            if not self.write_file(file_path, content):
-                self.stats.add_error(node.page_id, "Failed to write file")
-                return False
+    def export_node(
+        self,
+        node: PageNode,
+        parent_path: Union[str, Path],
+        verbose: bool = False
+    ) -> bool:
+        """
+        Export a page node and all of its descendants.
 
-            self.stats.pages_exported += 1
+        Uses an explicit stack rather than recursion, so deep hierarchies
+        can't hit the interpreter's recursion limit. Pages are exported in
+        the same depth-first order as before; children of a page that
+        failed to export are skipped.
 
-        return True
+        Args:
+            node: PageNode to export
+            parent_path: Parent directory path
+            verbose: Show verbose progress
+
+        Returns:
+            True if the given node itself was exported, False otherwise
+        """
+        root_success = False
+        # Paths are handled as strings, which is cheaper than joining Paths
+        stack = [(node, os.fspath(parent_path))]
+
+        while stack:
+            current, current_parent = stack.pop()
+            success = self._export_single_node(current, current_parent, verbose)
+
+            if current is node:
+                root_success = success
+
+            if success and current.children:
+                folder_path = os.path.join(current_parent, current.sanitized_title)
+                # Push in reverse so children are exported in order
+                for child in reversed(current.children):
+                    stack.append((child, folder_path))
+
+        return root_success
 
     def export_hierarchy(
         self,
         roots: List[PageNode],
-        verbose: bool = False
+        verbose: bool = False,
+        max_workers: int = 8,
+        conversion_workers: int = 1
     ) -> ExportStats:
         """
         Export a complete page hierarchy.
 
+        Page content for every node is fetched concurrently in the
+        background while pages are converted and written in tree order.
+        Pages unchanged since the previous export are served from the
+        page cache when enabled.
+
         Args:
             roots: List of root PageNodes
             verbose: Show verbose progress
+            max_workers: Number of concurrent content fetches
+            conversion_workers: Number of processes converting large pages
+                                to markdown (1 = convert in-process)
 
         Returns:
             ExportStats object
         """
+        # Don't let memoized titles from a previous run accumulate
+        clear_filename_cache()
+        self._dir_cache.clear()
+
         # Create output directory
         if not self.create_directory(self.output_dir):
-            print(f"Failed to create output directory: {self.output_dir}")
+            logger.error(f"Failed to create output directory: {self.output_dir}")
             return self.stats
 
-        # Export each root
-        for root in roots:
-            self.export_node(root, self.output_dir, verbose)
+        if self.use_cache:
+            # Recorded unsupported features depend on the converter options
+            options = json.dumps(
+                {"track_skipped_databases": self.converter.track_skipped_databases}
+            )
+            try:
+                self.cache = PageCache(self.output_dir / CACHE_FILENAME, options)
+            except sqlite3.Error as e:
+                logger.warning(f"Warning: Could not open page cache: {e}")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+                ThreadPoolExecutor(max_workers=WRITE_WORKERS) as write_executor:
+            self._write_executor = write_executor
+
+            conversion_executor = None
+            if conversion_workers > 1:
+                conversion_executor = ProcessPoolExecutor(
+                    max_workers=conversion_workers
+                )
+                self._submit_conversions(roots, conversion_executor)
+
+            # Queue content fetches in the order pages will be exported,
+            # skipping pages the cache can serve
+            for node in iter_nodes(roots):
+                if node.blocks is not None:
+                    continue
+                if self._get_fresh_cache_entry(node.page_id, node.last_edited_time):
+                    continue
+                self._block_futures[node.page_id] = executor.submit(
+                    self.client.get_block_children, node.page_id
+                )
+
+            try:
+                # Export each root
+                for root in roots:
+                    self.export_node(root, self.output_dir, verbose)
+            finally:
+                self._flush_writes()
+                self._write_executor = None
+
+                # Don't wait on fetches for pages that were never exported
+                for future in self._block_futures.values():
+                    future.cancel()
+                self._block_futures.clear()
+
+                if conversion_executor is not None:
+                    for future in self._conversion_futures.values():
+                        future.cancel()
+                    self._conversion_futures.clear()
+                    conversion_executor.shutdown()
+
+                if self.cache is not None:
+                    self.cache.close()
+                    self.cache = None
+
+        flush_log()
 
         # Copy unsupported features from converter to stats
         self.stats.unsupported_features = self.converter.unsupported_features
@@ -334,31 +1013,29 @@ class Exporter:
         print("=" * 60)
 
         for root in roots:
-            self._print_node_structure(root, self.output_dir, 0)
+            self._print_node_structure(root, 0)
 
-    def _print_node_structure(
-        self,
-        node: PageNode,
-        parent_path: Path,
-        indent: int
-    ) -> None:
-        """Helper method to print node structure recursively."""
-        prefix = "  " * indent
+    def _print_node_structure(self, node: PageNode, indent: int) -> None:
+        """Helper method to print node structure (iteratively, depth-first)."""
+        stack = [(node, indent)]
 
-        if node.children:
-            # Folder with index.md
-            folder_name = sanitize_filename(node.title)
-            folder_path = parent_path / folder_name
+        while stack:
+            current, current_indent = stack.pop()
+            prefix = "  " * current_indent
 
-            print(f"{prefix}📁 {folder_name}/")
-            print(f"{prefix}  📄 index.md")
+            if current.children:
+                # Folder with index.md
+                folder_name = current.sanitized_title
 
-            for child in node.children:
-                self._print_node_structure(child, folder_path, indent + 1)
-        else:
-            # Single file
-            filename = sanitize_filename(node.title) + ".md"
-            print(f"{prefix}📄 {filename}")
+                print(f"{prefix}📁 {folder_name}/")
+                print(f"{prefix}  📄 index.md")
+
+                for child in reversed(current.children):
+                    stack.append((child, current_indent + 1))
+            else:
+                # Single file
+                filename = current.sanitized_title + ".md"
+                print(f"{prefix}📄 {filename}")
 
 
 def export_notion_workspace(
@@ -367,11 +1044,16 @@ def export_notion_workspace(
     page_id: Optional[str] = None,
     dry_run: bool = False,
     verbose: bool = False,
-    include_databases: bool = False
+    include_databases: bool = False,
+    use_cache: bool = True,
+    workers: int = 1
 ) -> ExportStats:
     """
     Main export function for Notion workspace.
 
+    Progress is logged to stdout as by configure_logging(), unless the
+    caller has configured logging itself.
+
     Args:
         client: Notion client wrapper
         output_dir: Output directory path
@@ -379,24 +1061,49 @@ def export_notion_workspace(
         dry_run: If True, only show what would be done
         verbose: Show detailed progress
         include_databases: If True, export databases
+        use_cache: If True, reuse markdown of unchanged pages
+        workers: Number of processes converting pages to markdown
 
     Returns:
         ExportStats object
     """
     from hierarchy import build_full_hierarchy
 
+    configure_logging(logging.DEBUG if verbose else logging.INFO)
+
     # Build page hierarchy
     if verbose or dry_run:
         print("Building page hierarchy...")
 
-    roots = build_full_hierarchy(client, page_id)
+    # Let unchanged pages reuse their child page lists from the last export.
+    # Dry runs leave the output directory (and the cache in it) untouched
+    child_cache = None
+    cache_path = Path(output_dir) / CACHE_FILENAME
+    if use_cache and not dry_run and cache_path.exists():
+        try:
+            child_cache = PageCache(cache_path)
+        except sqlite3.Error as e:
+            logger.warning(f"Warning: Could not open page cache: {e}")
+
+    try:
+        roots = build_full_hierarchy(client, page_id, child_cache=child_cache)
+    finally:
+        if child_cache is not None:
+            child_cache.close()
+    flush_log()
 
     if not roots:
         print("No pages found to export.")
         return ExportStats()
 
     # Create exporter
-    exporter = Exporter(client, Path(output_dir), dry_run=dry_run, include_databases=include_databases)
+    exporter = Exporter(
+        client,
+        output_dir,
+        dry_run=dry_run,
+        include_databases=include_databases,
+        use_cache=use_cache
+    )
 
     # Dry run preview
     if dry_run:
@@ -409,7 +1116,9 @@ def export_notion_workspace(
         print(f"\nExporting to: {output_dir}")
         print("=" * 60)
 
-    stats = exporter.export_hierarchy(roots, verbose=verbose)
+    stats = exporter.export_hierarchy(
+        roots, verbose=verbose, conversion_workers=workers
+    )
 
     return stats
 
@@ -420,6 +1129,8 @@ if __name__ == '__main__':
 
     print("Testing exporter with dry run...")
 
+    configure_logging()
+
     try:
         client = create_client()
         stats = export_notion_workspace(
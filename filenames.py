@@ -0,0 +1,74 @@
+"""
+Filename sanitization for exported pages.
+
+Used by PageNode in hierarchy.py, which sanitizes each page title once,
+and by the exporter when it picks unique file names. Both use the default
+length, so they call sanitize_filename_default directly.
+"""
+
+import re
+from functools import lru_cache
+
+
+# Characters that are invalid in filenames: / \ : * ? " < > |
+_INVALID_FILENAME_CHARS = str.maketrans({c: '_' for c in '/\\:*?"<>|'})
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Default maximum length of a sanitized filename (without extension)
+MAX_FILENAME_LENGTH = 200
+
+
+def _sanitize(name: str, max_length: int) -> str:
+    """Sanitize a filename (uncached implementation of sanitize_filename)."""
+    # Replace invalid characters
+    sanitized = name.translate(_INVALID_FILENAME_CHARS)
+
+    # Remove leading/trailing whitespace and dots
+    sanitized = sanitized.strip('. ')
+
+    # Replace multiple spaces with single space
+    sanitized = _WHITESPACE_RE.sub(' ', sanitized)
+
+    # Truncate to max length
+    if len(sanitized) > max_length:
+        sanitized = sanitized[:max_length].rstrip('. ')
+
+    # Ensure it's not empty
+    if not sanitized:
+        sanitized = "Untitled"
+
+    return sanitized
+
+
+@lru_cache(maxsize=16384)
+def sanitize_filename_default(name: str) -> str:
+    """
+    Sanitize a filename to MAX_FILENAME_LENGTH, memoizing the result.
+
+    Same as sanitize_filename(name), without the max_length check, for
+    callers on the hot path.
+    """
+    return _sanitize(name, MAX_FILENAME_LENGTH)
+
+
+def sanitize_filename(name: str, max_length: int = MAX_FILENAME_LENGTH) -> str:
+    """
+    Sanitize a string to be used as a filename.
+
+    Results for the default max_length are memoized.
+
+    Args:
+        name: The original name
+        max_length: Maximum filename length
+
+    Returns:
+        Sanitized filename
+    """
+    if max_length == MAX_FILENAME_LENGTH:
+        return sanitize_filename_default(name)
+    return _sanitize(name, max_length)
+
+
+def clear_filename_cache() -> None:
+    """Forget memoized sanitize_filename_default results."""
+    sanitize_filename_default.cache_clear()
@@ -5,23 +5,75 @@ This module provides functionality to discover and build a hierarchical
 tree structure of Notion pages and their relationships.
 """
 
-from typing import List, Dict, Optional, Set
-from dataclasses import dataclass, field
+import logging
+from concurrent.futures import (
+    FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+)
+from typing import TYPE_CHECKING, Iterable, List, Dict, Optional, Sequence, Set, Tuple
 from client_wrapper import NotionClientWrapper
+from filenames import sanitize_filename_default
+
+if TYPE_CHECKING:
+    from exporter import PageCache
+
+# Shared with exporter.py, which configures its output
+logger = logging.getLogger("notion_exporter")
 
 
-@dataclass
 class PageNode:
-    """Represents a page in the hierarchy tree."""
+    """
+    Represents a page in the hierarchy tree.
 
-    page_id: str
-    title: str
-    parent_id: Optional[str] = None
-    children: List['PageNode'] = field(default_factory=list)
-    is_database: bool = False
-    has_content: bool = True  # Whether the page has any block content
-    created_time: Optional[str] = None
-    last_edited_time: Optional[str] = None
+    Workspaces can have tens of thousands of pages, so nodes use __slots__
+    and keep their children in a tuple.
+    """
+
+    __slots__ = (
+        "page_id", "title", "parent_id", "children", "is_database",
+        "has_content", "created_time", "last_edited_time", "blocks",
+        "sanitized_title",
+    )
+
+    def __init__(
+        self,
+        page_id: str,
+        title: str,
+        parent_id: Optional[str] = None,
+        children: Sequence['PageNode'] = (),
+        is_database: bool = False,
+        has_content: bool = True,
+        created_time: Optional[str] = None,
+        last_edited_time: Optional[str] = None,
+        blocks: Optional[List[Dict]] = None
+    ):
+        self.page_id = page_id
+        self.title = title
+        self.parent_id = parent_id
+        self.children: Tuple['PageNode', ...] = tuple(children)
+        self.is_database = is_database
+        self.has_content = has_content  # Whether the page has any block content
+        self.created_time = created_time
+        self.last_edited_time = last_edited_time
+        # Page content fetched during discovery, reused by the exporter
+        self.blocks = blocks
+
+        # Filesystem-safe version of the title, computed once
+        self.sanitized_title = sanitize_filename_default(title)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PageNode):
+            return NotImplemented
+        return (
+            self.page_id, self.title, self.parent_id, self.children,
+            self.is_database, self.has_content, self.created_time,
+            self.last_edited_time
+        ) == (
+            other.page_id, other.title, other.parent_id, other.children,
+            other.is_database, other.has_content, other.created_time,
+            other.last_edited_time
+        )
+
+    __hash__ = None
 
     def __repr__(self) -> str:
         child_count = len(self.children)
@@ -39,6 +91,12 @@ class PageNode:
         Returns:
             Formatted tree string
         """
+        out: List[str] = []
+        self._to_tree_string(out, indent, is_last)
+        return "".join(out)
+
+    def _to_tree_string(self, out: List[str], indent: int, is_last: bool) -> None:
+        """Append the lines of to_tree_string to out."""
         prefix = "  " * indent
         connector = "└─ " if is_last else "├─ "
 
@@ -46,19 +104,20 @@ class PageNode:
             connector = ""
 
         db_marker = " [Database]" if self.is_database else ""
-        result = f"{prefix}{connector}{self.title}{db_marker}\n"
+        out.append(f"{prefix}{connector}{self.title}{db_marker}\n")
 
+        last_index = len(self.children) - 1
         for i, child in enumerate(self.children):
-            is_last_child = i == len(self.children) - 1
-            result += child.to_tree_string(indent + 1, is_last_child)
-
-        return result
+            child._to_tree_string(out, indent + 1, i == last_index)
 
 
 def extract_page_title(page: dict) -> str:
     """
     Extract the title from a Notion page object.
 
+    The plain text of all the title's spans is joined, giving the same
+    title as the page's child_page block (see extract_child_page_title).
+
     Args:
         page: Notion page object
 
@@ -73,7 +132,7 @@ def extract_page_title(page: dict) -> str:
         if prop_value.get("type") == "title":
             title_array = prop_value.get("title", [])
             if title_array and len(title_array) > 0:
-                return title_array[0].get("plain_text", "Untitled")
+                return "".join([span.get("plain_text", "") for span in title_array])
 
     return "Untitled"
 
@@ -95,6 +154,61 @@ def extract_child_page_title(block: dict) -> str:
     return "Untitled"
 
 
+def fetch_blocks_and_child_pages(
+    client: NotionClientWrapper,
+    page_id: str,
+    confirm_page: bool = False
+) -> Tuple[Optional[List[Dict]], List[Dict]]:
+    """
+    Fetch a page's blocks and pick out its child pages.
+
+    Args:
+        client: Notion client wrapper
+        page_id: The parent page ID
+        confirm_page: If the blocks can't be fetched, fetch the page itself
+                      so a page that is gone raises instead (for nodes
+                      built from a child_page block without fetching)
+
+    Returns:
+        Tuple of (all blocks or None if they couldn't be fetched,
+        child page blocks)
+
+    Raises:
+        Exception: If confirm_page is set and the page can't be fetched
+    """
+    try:
+        blocks = client.get_block_children(page_id)
+    except Exception as e:
+        if confirm_page:
+            client.get_page(page_id)
+        logger.warning(f"Warning: Could not fetch children of page {page_id}: {e}")
+        return None, []
+
+    return blocks, select_child_pages(blocks)
+
+
+def select_child_pages(blocks: List[Dict]) -> List[Dict]:
+    """
+    Pick out the child page blocks from a page's blocks.
+
+    Args:
+        blocks: List of Notion block objects
+
+    Returns:
+        List of child page (and child database) blocks
+    """
+    child_pages = []
+
+    for block in blocks:
+        if block.get("type") == "child_page":
+            child_pages.append(block)
+        elif block.get("type") == "child_database":
+            # Treat databases as pages too
+            child_pages.append(block)
+
+    return child_pages
+
+
 def discover_child_pages(client: NotionClientWrapper, page_id: str) -> List[Dict]:
     """
     Discover all child pages of a given page.
@@ -106,22 +220,90 @@ def discover_child_pages(client: NotionClientWrapper, page_id: str) -> List[Dict
     Returns:
         List of child page blocks
     """
-    child_pages = []
+    return fetch_blocks_and_child_pages(client, page_id)[1]
 
-    try:
-        blocks = client.get_block_children(page_id)
 
-        for block in blocks:
-            if block.get("type") == "child_page":
-                child_pages.append(block)
-            elif block.get("type") == "child_database":
-                # Treat databases as pages too
-                child_pages.append(block)
+def make_page_node(page: dict, page_id: str, parent_id: Optional[str]) -> PageNode:
+    """
+    Create a PageNode (without children) from a Notion page object.
 
-    except Exception as e:
-        print(f"Warning: Could not fetch children of page {page_id}: {e}")
+    Args:
+        page: Notion page object
+        page_id: The page ID
+        parent_id: The parent page ID (None for root)
+
+    Returns:
+        PageNode for the page
+    """
+    return PageNode(
+        page_id=page_id,
+        title=extract_page_title(page),
+        parent_id=parent_id,
+        is_database=page.get("object") == "database",
+        created_time=page.get("created_time"),
+        last_edited_time=page.get("last_edited_time")
+    )
 
-    return child_pages
+
+def make_child_page_node(block: dict, parent_id: Optional[str]) -> PageNode:
+    """
+    Create a PageNode (without children) from a child_page block.
+
+    The block carries the page's title and timestamps, so the page itself
+    doesn't need to be fetched.
+
+    Args:
+        block: Notion block object with type "child_page"
+        parent_id: The parent page ID
+
+    Returns:
+        PageNode for the child page
+    """
+    return PageNode(
+        page_id=block["id"],
+        title=extract_child_page_title(block),
+        parent_id=parent_id,
+        created_time=block.get("created_time"),
+        last_edited_time=block.get("last_edited_time")
+    )
+
+
+def _is_built_from_block(page: Optional[dict], child_block: Optional[dict]) -> bool:
+    """Check whether load_page_node builds a node from its child_page block."""
+    return (
+        page is None
+        and child_block is not None
+        and child_block.get("type") == "child_page"
+    )
+
+
+def load_page_node(
+    client: NotionClientWrapper,
+    page_id: str,
+    parent_id: Optional[str] = None,
+    page: Optional[dict] = None,
+    child_block: Optional[dict] = None
+) -> PageNode:
+    """
+    Create the PageNode for a page, fetching the page only when needed.
+
+    Args:
+        client: Notion client wrapper
+        page_id: The page ID
+        parent_id: The parent page ID (None for root)
+        page: Page object, if already known (e.g. from search)
+        child_block: The parent's block for this page, if known
+
+    Returns:
+        PageNode for the page (without children)
+    """
+    if _is_built_from_block(page, child_block):
+        return make_child_page_node(child_block, parent_id)
+
+    if page is None:
+        page = client.get_page(page_id)
+
+    return make_page_node(page, page_id, parent_id)
 
 
 def build_page_tree(
@@ -130,7 +312,11 @@ def build_page_tree(
     parent_id: Optional[str] = None,
     visited: Optional[Set[str]] = None,
     depth: int = 0,
-    max_depth: int = 10
+    max_depth: int = 10,
+    page: Optional[dict] = None,
+    child_block: Optional[dict] = None,
+    pages: Optional[Dict[str, dict]] = None,
+    child_cache: Optional["PageCache"] = None
 ) -> Optional[PageNode]:
     """
     Recursively build a tree of pages starting from a root page.
@@ -142,6 +328,14 @@ def build_page_tree(
         visited: Set of already visited page IDs (to prevent cycles)
         depth: Current recursion depth
         max_depth: Maximum recursion depth to prevent infinite loops
+        page: Page object, if already known (skips fetching it)
+        child_block: The parent's block for this page, if known (child
+                     pages are then built from it without fetching)
+        pages: Current page objects by ID (e.g. from search), used for
+               this page and its descendants
+        child_cache: Page cache of the previous export; unchanged pages
+                     reuse their cached child page list instead of
+                     fetching their blocks
 
     Returns:
         PageNode representing the page and its children, or None if error
@@ -152,76 +346,212 @@ def build_page_tree(
 
     # Check for cycles
     if page_id in visited:
-        print(f"Warning: Circular reference detected for page {page_id}")
+        logger.warning(f"Warning: Circular reference detected for page {page_id}")
         return None
 
     # Check depth limit
     if depth >= max_depth:
-        print(f"Warning: Maximum depth {max_depth} reached for page {page_id}")
+        logger.warning(f"Warning: Maximum depth {max_depth} reached for page {page_id}")
         return None
 
     # Mark as visited
     visited.add(page_id)
 
-    try:
-        # Get the page
-        page = client.get_page(page_id)
-
-        # Determine if it's a database
-        is_database = page.get("object") == "database"
-
-        # Extract title
-        title = extract_page_title(page)
-
-        # Create node
-        node = PageNode(
-            page_id=page_id,
-            title=title,
-            parent_id=parent_id,
-            is_database=is_database,
-            created_time=page.get("created_time"),
-            last_edited_time=page.get("last_edited_time")
-        )
+    if pages is None:
+        pages = {}
+    if page is None:
+        page = pages.get(page_id)
 
-        # Discover child pages
-        child_page_blocks = discover_child_pages(client, page_id)
+    try:
+        # Create the page's node
+        node = load_page_node(client, page_id, parent_id, page, child_block)
+
+        # Discover child pages, keeping the blocks for export
+        child_page_blocks = cached_child_pages(child_cache, page_id, page)
+        if child_page_blocks is None:
+            node.blocks, child_page_blocks = fetch_blocks_and_child_pages(
+                client, page_id, _is_built_from_block(page, child_block)
+            )
 
         # Recursively build children
+        children = []
         for child_block in child_page_blocks:
-            child_id = child_block["id"]
-            child_type = child_block.get("type")
-
-            # Get title from block
-            if child_type == "child_page":
-                child_title = extract_child_page_title(child_block)
-            elif child_type == "child_database":
-                child_db = child_block.get("child_database", {})
-                child_title = child_db.get("title", "Untitled Database")
-            else:
-                child_title = "Untitled"
-
-            # Build child tree
             child_node = build_page_tree(
                 client,
-                child_id,
+                child_block["id"],
                 parent_id=page_id,
                 visited=visited,
                 depth=depth + 1,
-                max_depth=max_depth
+                max_depth=max_depth,
+                child_block=child_block,
+                pages=pages,
+                child_cache=child_cache
             )
 
             if child_node:
-                # Override title from the full page object
-                node.children.append(child_node)
+                children.append(child_node)
 
+        node.children = tuple(children)
         return node
 
     except Exception as e:
-        print(f"Error processing page {page_id}: {e}")
+        logger.error(f"Error processing page {page_id}: {e}")
+        return None
+
+
+def cached_child_pages(
+    child_cache: Optional["PageCache"],
+    page_id: str,
+    page: Optional[dict]
+) -> Optional[List[Dict]]:
+    """
+    Look up a page's child page blocks from the previous export.
+
+    The cached list is only used when the page's current last_edited_time
+    (known from search) matches the one it was cached with, as adding or
+    removing a child page edits its parent.
+
+    Args:
+        child_cache: Page cache from the previous export, if any
+        page_id: The page ID
+        page: Current page object, if known
+
+    Returns:
+        Child page blocks, or None if they have to be fetched (including
+        when the cache can't be read; it then disables itself)
+    """
+    if child_cache is None or page is None:
         return None
 
+    return child_cache.get_child_pages(page_id, page.get("last_edited_time"))
+
 
-def discover_all_root_pages(client: NotionClientWrapper) -> List[Dict]:
+def _fetch_page_and_children(
+    client: NotionClientWrapper,
+    page_id: str,
+    parent_id: Optional[str],
+    page: Optional[dict],
+    child_block: Optional[dict]
+) -> Tuple[PageNode, List[Dict]]:
+    """Load a page's node and its child page blocks (one unit of parallel work)."""
+    node = load_page_node(client, page_id, parent_id, page, child_block)
+    node.blocks, child_page_blocks = fetch_blocks_and_child_pages(
+        client, page_id, _is_built_from_block(page, child_block)
+    )
+    return node, child_page_blocks
+
+
+def build_page_trees_parallel(
+    client: NotionClientWrapper,
+    root_page_ids: List[str],
+    executor: Executor,
+    max_depth: int = 10,
+    pages: Optional[Dict[str, dict]] = None,
+    child_cache: Optional["PageCache"] = None
+) -> List[Optional[PageNode]]:
+    """
+    Build page trees for several roots, fetching pages concurrently.
+
+    Each page's children are submitted to the executor as soon as the page
+    itself has been fetched, so sibling and cousin fetches overlap. Trees
+    are assembled on the calling thread, preserving child order, so the
+    visited set needs no locking.
+
+    Args:
+        client: Notion client wrapper
+        root_page_ids: Page IDs to build trees from
+        executor: Executor used to run API calls
+        max_depth: Maximum recursion depth to prevent infinite loops
+        pages: Already fetched page objects by ID (e.g. from search);
+               these pages are not fetched again
+        child_cache: Page cache of the previous export; unchanged pages
+                     reuse their cached child page list instead of
+                     fetching their blocks
+
+    Returns:
+        One PageNode per root (None where the root couldn't be fetched)
+    """
+    if pages is None:
+        pages = {}
+
+    visited: Set[str] = set()
+    roots: List[Optional[PageNode]] = [None] * len(root_page_ids)
+    # node -> slots for its children, filled in as they are fetched
+    child_slots: Dict[int, Tuple[PageNode, List[Optional[PageNode]]]] = {}
+    # future -> (page_id, parent node or None, index in parent/roots, depth)
+    pending: Dict[Future, Tuple[str, Optional[PageNode], int, int]] = {}
+
+    def schedule(
+        page_id: str,
+        parent: Optional[PageNode],
+        index: int,
+        depth: int,
+        child_block: Optional[dict] = None
+    ):
+        if page_id in visited:
+            logger.warning(f"Warning: Circular reference detected for page {page_id}")
+            return
+        if depth >= max_depth:
+            logger.warning(f"Warning: Maximum depth {max_depth} reached for page {page_id}")
+            return
+
+        visited.add(page_id)
+        parent_id = parent.page_id if parent else None
+        page = pages.get(page_id)
+
+        # The cache lookup stays on this thread, as does the connection
+        child_page_blocks = cached_child_pages(child_cache, page_id, page)
+        if child_page_blocks is not None:
+            future = Future()
+            future.set_result(
+                (make_page_node(page, page_id, parent_id), child_page_blocks)
+            )
+        else:
+            future = executor.submit(
+                _fetch_page_and_children, client, page_id,
+                parent_id, page, child_block
+            )
+        pending[future] = (page_id, parent, index, depth)
+
+    for index, page_id in enumerate(root_page_ids):
+        schedule(page_id, None, index, 0)
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            page_id, parent, index, depth = pending.pop(future)
+
+            try:
+                node, child_page_blocks = future.result()
+            except Exception as e:
+                logger.error(f"Error processing page {page_id}: {e}")
+                continue
+
+            if parent is None:
+                roots[index] = node
+            else:
+                child_slots[id(parent)][1][index] = node
+
+            # Reserve slots so children keep their block order
+            child_slots[id(node)] = (node, [None] * len(child_page_blocks))
+            for child_index, child_block in enumerate(child_page_blocks):
+                schedule(
+                    child_block["id"], node, child_index, depth + 1,
+                    child_block=child_block
+                )
+
+    # Drop slots for children that were skipped or failed
+    for node, slots in child_slots.values():
+        node.children = tuple(child for child in slots if child is not None)
+
+    return roots
+
+
+def discover_all_root_pages(
+    client: NotionClientWrapper,
+    all_pages: Optional[Iterable[Dict]] = None
+) -> List[Dict]:
     """
     Discover all root-level pages accessible to the integration.
 
@@ -229,13 +559,15 @@ def discover_all_root_pages(client: NotionClientWrapper) -> List[Dict]:
 
     Args:
         client: Notion client wrapper
+        all_pages: Results of searching for all pages, if already known
 
     Returns:
         List of root page objects
     """
     try:
-        # Search for all pages
-        all_pages = client.search_pages()
+        # Search for all pages, streaming results so only roots are kept
+        if all_pages is None:
+            all_pages = client.iter_search_pages()
 
         # Filter out pages that have a parent page
         # (only keep workspace roots and pages in the workspace)
@@ -253,14 +585,16 @@ def discover_all_root_pages(client: NotionClientWrapper) -> List[Dict]:
         return root_pages
 
     except Exception as e:
-        print(f"Error discovering root pages: {e}")
+        logger.error(f"Error discovering root pages: {e}")
         return []
 
 
 def build_full_hierarchy(
     client: NotionClientWrapper,
     root_page_id: Optional[str] = None,
-    max_depth: int = 10
+    max_depth: int = 10,
+    max_workers: int = 8,
+    child_cache: Optional["PageCache"] = None
 ) -> List[PageNode]:
     """
     Build the complete page hierarchy.
@@ -270,30 +604,51 @@ def build_full_hierarchy(
         root_page_id: Optional specific page ID to start from.
                       If None, discovers all root pages.
         max_depth: Maximum depth to traverse
+        max_workers: Number of concurrent API workers (1 = sequential)
+        child_cache: Page cache of the previous export. When discovering
+                     all pages, pages unchanged since then reuse their
+                     cached child page list instead of fetching blocks.
 
     Returns:
         List of root PageNodes
     """
-    roots = []
+    # Page objects already fetched by search, by ID
+    pages: Dict[str, dict] = {}
 
     if root_page_id:
-        # Build tree from specific page
-        root_node = build_page_tree(client, root_page_id, max_depth=max_depth)
-        if root_node:
-            roots.append(root_node)
+        root_page_ids = [root_page_id]
     else:
-        # Discover all root pages and build trees
-        root_pages = discover_all_root_pages(client)
+        # Discover all root pages
+        try:
+            all_pages = client.search_pages()
+        except Exception as e:
+            logger.error(f"Error discovering root pages: {e}")
+            all_pages = []
 
-        print(f"Discovered {len(root_pages)} root page(s)")
+        discovered = discover_all_root_pages(client, all_pages)
 
-        for page in root_pages:
-            page_id = page["id"]
-            root_node = build_page_tree(client, page_id, max_depth=max_depth)
-            if root_node:
-                roots.append(root_node)
+        logger.info(f"Discovered {len(discovered)} root page(s)")
 
-    return roots
+        root_page_ids = [page["id"] for page in discovered]
+        pages = {page["id"]: page for page in all_pages}
+
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            trees = build_page_trees_parallel(
+                client, root_page_ids, executor, max_depth=max_depth,
+                pages=pages, child_cache=child_cache
+            )
+    else:
+        # Single-threaded fallback
+        trees = [
+            build_page_tree(
+                client, page_id, max_depth=max_depth,
+                pages=pages, child_cache=child_cache
+            )
+            for page_id in root_page_ids
+        ]
+
+    return [root for root in trees if root]
 
 
 def print_hierarchy(roots: List[PageNode]) -> None:
@@ -316,6 +671,7 @@ def print_hierarchy(roots: List[PageNode]) -> None:
 
 if __name__ == '__main__':
     """Test the hierarchy module."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("Building page hierarchy...")
     print()
 
@@ -340,4 +696,10 @@ if __name__ == '__main__':
 
 def count_pages(node: PageNode) -> int:
     """Count total pages in a tree."""
-    return 1 + sum(count_pages(child) for child in node.children)
+    count = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        count += 1
+        stack.extend(current.children)
+    return count
@@ -6,13 +6,14 @@ Main CLI entry point for exporting Notion workspaces to local Markdown files.
 """
 
 import argparse
+import logging
 import sys
 from pathlib import Path
 from typing import Optional
 
 import config
 from client_wrapper import create_client
-from exporter import export_notion_workspace
+from exporter import configure_logging, export_notion_workspace
 from reporter import generate_feature_report
 
 
@@ -79,6 +80,19 @@ For more information, see README.md
         help="Include database exports (experimental)"
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-fetch and re-convert every page instead of reusing unchanged pages from the last export"
+    )
+
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Number of processes converting large pages to markdown (default: 1)"
+    )
+
     return parser.parse_args()
 
 
@@ -121,6 +135,8 @@ def main():
     """Main entry point."""
     args = parse_arguments()
 
+    configure_logging(logging.DEBUG if args.verbose else logging.INFO)
+
     print_banner()
 
     # Initialize client
@@ -164,7 +180,9 @@ def main():
             page_id=args.page_id,
             dry_run=args.dry_run,
             verbose=args.verbose,
-            include_databases=args.include_databases
+            include_databases=args.include_databases,
+            use_cache=not args.no_cache,
+            workers=args.workers
         )
 
         # Print stats (if not dry-run)
@@ -5,21 +5,110 @@ This module converts Notion block objects into Markdown format,
 handling various block types and rich text formatting.
 """
 
-from typing import List, Dict, Any, Tuple, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Callable, NamedTuple, Tuple, Optional
 
 
-class UnsupportedFeature:
+class UnsupportedFeature(NamedTuple):
     """Represents an unsupported feature encountered during conversion."""
 
-    def __init__(self, block_type: str, feature: str, block_id: str):
-        self.block_type = block_type
-        self.feature = feature
-        self.block_id = block_id
+    block_type: str
+    feature: str
+    block_id: str
 
     def __repr__(self) -> str:
         return f"Unsupported: {self.block_type}.{self.feature} (block: {self.block_id})"
 
 
+def _build_annotation_marks() -> List[Tuple[str, str]]:
+    """
+    Precompute the markdown wrapping for every combination of annotations.
+
+    Index bits are code (1), bold (2), italic (4) and strikethrough (8);
+    code is innermost and strikethrough outermost.
+    """
+    marks = []
+    for mask in range(16):
+        prefix = suffix = ""
+        for bit, mark in ((1, "`"), (2, "**"), (4, "*"), (8, "~~")):
+            if mask & bit:
+                prefix = mark + prefix
+                suffix = suffix + mark
+        marks.append((prefix, suffix))
+    return marks
+
+
+# Annotation bitmask -> (prefix, suffix), see _build_annotation_marks
+_ANNOTATION_MARKS = _build_annotation_marks()
+
+
+# Shared defaults for missing block fields, so lookups don't allocate
+_EMPTY_DICT: Dict = {}
+_EMPTY_LIST: List = []
+
+# Heading level -> (block key, markdown prefix)
+_HEADINGS = {
+    1: ("heading_1", "# "),
+    2: ("heading_2", "## "),
+    3: ("heading_3", "### "),
+}
+
+# Annotations of unformatted text, as returned by the Notion API
+_PLAIN_ANNOTATIONS = {
+    "bold": False,
+    "italic": False,
+    "strikethrough": False,
+    "underline": False,
+    "code": False,
+    "color": "default",
+}
+
+
+# Mention type -> text used when a mention has no plain_text
+_MENTION_PLACEHOLDERS = {
+    "page": "[page]",
+    "database": "[database]",
+    "date": "[date]",
+}
+
+
+def _rich_text_of(block: Dict, key: str) -> List[Dict]:
+    """Get block[key]["rich_text"], or an empty list if either is missing."""
+    try:
+        return block[key]["rich_text"]
+    except KeyError:
+        return _EMPTY_LIST
+
+
+def _file_url(file_obj: Dict) -> str:
+    """Get the URL of a Notion file object (an image or file block's body)."""
+    file_type = file_obj.get("type")
+    if file_type != "external" and file_type != "file":
+        return ""
+    try:
+        return file_obj[file_type].get("url", "")
+    except KeyError:
+        return ""
+
+
+@lru_cache(maxsize=64)
+def _table_separator(col_count: int) -> str:
+    """Get the header separator line of a table with col_count columns."""
+    return "|" + "|".join(["---"] * col_count) + "|\n"
+
+
+@lru_cache(maxsize=64)
+def _default_table_header(col_count: int) -> str:
+    """Get the placeholder header line of a table without a header row."""
+    header = " | ".join([f"Column {i+1}" for i in range(col_count)])
+    return f"| {header} |\n"
+
+
+def _no_markdown(block: Dict) -> str:
+    """Converter for blocks that produce no markdown of their own."""
+    return ""
+
+
 class MarkdownConverter:
     """Converts Notion blocks to Markdown format."""
 
@@ -27,6 +116,28 @@ class MarkdownConverter:
         self.unsupported_features: List[UnsupportedFeature] = []
         self.track_skipped_databases = track_skipped_databases
 
+        # Block type -> converter returning markdown, for block types that
+        # are always supported; see convert_block for the rest
+        self._simple_converters: Dict[str, Callable[[Dict], str]] = {
+            "paragraph": self.convert_paragraph,
+            "heading_1": lambda block: self.convert_heading(block, 1),
+            "heading_2": lambda block: self.convert_heading(block, 2),
+            "heading_3": lambda block: self.convert_heading(block, 3),
+            "bulleted_list_item": self.convert_bulleted_list_item,
+            "to_do": self.convert_to_do,
+            "toggle": self.convert_toggle,
+            "code": self.convert_code,
+            "quote": self.convert_quote,
+            "callout": self.convert_callout,
+            "divider": self.convert_divider,
+            # Child pages are handled separately in hierarchy
+            "child_page": _no_markdown,
+            # Tables need their row children, will be handled specially
+            "table": _no_markdown,
+            # Table rows are handled as part of table
+            "table_row": _no_markdown,
+        }
+
     def add_unsupported(self, block_type: str, feature: str, block_id: str):
         """Record an unsupported feature."""
         self.unsupported_features.append(
@@ -46,112 +157,117 @@ class MarkdownConverter:
         if not rich_text_array:
             return ""
 
-        result = []
-
-        for text_obj in rich_text_array:
-            text_type = text_obj.get("type", "text")
-
-            if text_type == "text":
-                content = text_obj.get("text", {}).get("content", "")
-                link = text_obj.get("text", {}).get("link")
-            elif text_type == "mention":
-                # Handle mentions (user, page, database, date)
-                mention = text_obj.get("mention", {})
-                mention_type = mention.get("type")
-
-                if mention_type == "user":
-                    content = f"@{text_obj.get('plain_text', 'user')}"
-                elif mention_type == "page":
-                    content = text_obj.get('plain_text', '[page]')
-                elif mention_type == "database":
-                    content = text_obj.get('plain_text', '[database]')
-                elif mention_type == "date":
-                    content = text_obj.get('plain_text', '[date]')
-                else:
-                    content = text_obj.get('plain_text', '[mention]')
-                link = None
-            elif text_type == "equation":
-                # LaTeX equations - use inline code as fallback
-                expression = text_obj.get("equation", {}).get("expression", "")
-                content = f"${expression}$"
-                link = None
-            else:
-                content = text_obj.get("plain_text", "")
-                link = None
+        format_span = self._convert_rich_text_span
 
-            # Apply annotations (formatting)
-            annotations = text_obj.get("annotations", {})
+        # A single span is by far the most common case
+        if len(rich_text_array) == 1:
+            return format_span(rich_text_array[0])
 
-            if annotations.get("code"):
-                content = f"`{content}`"
-            if annotations.get("bold"):
-                content = f"**{content}**"
-            if annotations.get("italic"):
-                content = f"*{content}*"
-            if annotations.get("strikethrough"):
-                content = f"~~{content}~~"
+        return "".join([format_span(text_obj) for text_obj in rich_text_array])
 
-            # Handle links
-            href = text_obj.get("href") or (link.get("url") if link else None)
-            if href:
-                # If it's already formatted with code/bold/italic, wrap the markdown
-                content = f"[{content}]({href})"
+    def _convert_rich_text_span(self, text_obj: Dict) -> str:
+        """Convert one rich text object to Markdown."""
+        text_type = text_obj.get("type", "text")
+        href = text_obj.get("href")
+        annotations = text_obj.get("annotations")
 
-            result.append(content)
+        if text_type == "text":
+            text = text_obj.get("text", _EMPTY_DICT)
+            content = text.get("content", "")
+            if not href:
+                link = text.get("link")
+                href = link.get("url") if link else None
 
-        return "".join(result)
+            # Most spans are plain, unlinked text
+            if not href and (not annotations or annotations == _PLAIN_ANNOTATIONS):
+                return content
+        elif text_type == "mention":
+            # Handle mentions (user, page, database, date)
+            mention_type = text_obj.get("mention", _EMPTY_DICT).get("type")
+
+            if mention_type == "user":
+                content = f"@{text_obj.get('plain_text', 'user')}"
+            else:
+                content = text_obj.get(
+                    "plain_text",
+                    _MENTION_PLACEHOLDERS.get(mention_type, "[mention]")
+                )
+        elif text_type == "equation":
+            # LaTeX equations - use inline code as fallback
+            expression = text_obj.get("equation", _EMPTY_DICT).get("expression", "")
+            content = f"${expression}$"
+        else:
+            content = text_obj.get("plain_text", "")
+
+        # Apply annotations (formatting)
+        if annotations and annotations != _PLAIN_ANNOTATIONS:
+            mask = (
+                (1 if annotations.get("code") else 0)
+                | (2 if annotations.get("bold") else 0)
+                | (4 if annotations.get("italic") else 0)
+                | (8 if annotations.get("strikethrough") else 0)
+            )
+            if mask:
+                prefix, suffix = _ANNOTATION_MARKS[mask]
+                content = f"{prefix}{content}{suffix}"
+
+        # Handle links
+        if href:
+            # If it's already formatted with code/bold/italic, wrap the markdown
+            content = f"[{content}]({href})"
+
+        return content
 
     def convert_paragraph(self, block: Dict) -> str:
         """Convert a paragraph block to Markdown."""
-        paragraph = block.get("paragraph", {})
-        rich_text = paragraph.get("rich_text", [])
-        text = self.convert_rich_text(rich_text)
-        return text
+        rich_text = _rich_text_of(block, "paragraph")
+        # Empty paragraphs are common as spacing; skip the call for them
+        return self.convert_rich_text(rich_text) if rich_text else ""
 
     def convert_heading(self, block: Dict, level: int) -> str:
         """Convert a heading block to Markdown."""
-        heading_key = f"heading_{level}"
-        heading = block.get(heading_key, {})
-        rich_text = heading.get("rich_text", [])
-        text = self.convert_rich_text(rich_text)
-        return f"{'#' * level} {text}"
+        try:
+            heading_key, prefix = _HEADINGS[level]
+        except KeyError:
+            heading_key, prefix = f"heading_{level}", "#" * level + " "
+        rich_text = _rich_text_of(block, heading_key)
+        if not rich_text:
+            return prefix
+        return prefix + self.convert_rich_text(rich_text)
 
     def convert_bulleted_list_item(self, block: Dict) -> str:
         """Convert a bulleted list item to Markdown."""
-        item = block.get("bulleted_list_item", {})
-        rich_text = item.get("rich_text", [])
-        text = self.convert_rich_text(rich_text)
+        rich_text = _rich_text_of(block, "bulleted_list_item")
+        text = self.convert_rich_text(rich_text) if rich_text else ""
         return f"- {text}"
 
     def convert_numbered_list_item(self, block: Dict, number: int = 1) -> str:
         """Convert a numbered list item to Markdown."""
-        item = block.get("numbered_list_item", {})
-        rich_text = item.get("rich_text", [])
-        text = self.convert_rich_text(rich_text)
+        rich_text = _rich_text_of(block, "numbered_list_item")
+        text = self.convert_rich_text(rich_text) if rich_text else ""
         return f"{number}. {text}"
 
     def convert_to_do(self, block: Dict) -> str:
         """Convert a to-do item to Markdown checkbox."""
-        todo = block.get("to_do", {})
-        rich_text = todo.get("rich_text", [])
+        todo = block.get("to_do", _EMPTY_DICT)
+        rich_text = todo.get("rich_text", _EMPTY_LIST)
         checked = todo.get("checked", False)
-        text = self.convert_rich_text(rich_text)
+        text = self.convert_rich_text(rich_text) if rich_text else ""
         checkbox = "[x]" if checked else "[ ]"
         return f"- {checkbox} {text}"
 
     def convert_toggle(self, block: Dict) -> str:
         """Convert a toggle block to Markdown (as bold text)."""
-        toggle = block.get("toggle", {})
-        rich_text = toggle.get("rich_text", [])
-        text = self.convert_rich_text(rich_text)
+        rich_text = _rich_text_of(block, "toggle")
+        text = self.convert_rich_text(rich_text) if rich_text else ""
         # Toggles don't have a direct Markdown equivalent
         # Use bold text as a compromise
         return f"**{text}**"
 
     def convert_code(self, block: Dict) -> str:
         """Convert a code block to Markdown."""
-        code = block.get("code", {})
-        rich_text = code.get("rich_text", [])
+        code = block.get("code", _EMPTY_DICT)
+        rich_text = code.get("rich_text", _EMPTY_LIST)
         language = code.get("language", "")
 
         # Get the code text (no formatting needed inside code blocks)
@@ -164,23 +280,22 @@ class MarkdownConverter:
 
     def convert_quote(self, block: Dict) -> str:
         """Convert a quote block to Markdown."""
-        quote = block.get("quote", {})
-        rich_text = quote.get("rich_text", [])
-        text = self.convert_rich_text(rich_text)
+        rich_text = _rich_text_of(block, "quote")
+        text = self.convert_rich_text(rich_text) if rich_text else ""
         return f"> {text}"
 
     def convert_callout(self, block: Dict) -> str:
         """Convert a callout block to Markdown blockquote."""
-        callout = block.get("callout", {})
-        rich_text = callout.get("rich_text", [])
-        icon = callout.get("icon", {})
+        callout = block.get("callout", _EMPTY_DICT)
+        rich_text = callout.get("rich_text", _EMPTY_LIST)
+        icon = callout.get("icon", _EMPTY_DICT)
 
         # Get icon emoji if available
         icon_str = ""
         if icon.get("type") == "emoji":
             icon_str = icon.get("emoji", "")
 
-        text = self.convert_rich_text(rich_text)
+        text = self.convert_rich_text(rich_text) if rich_text else ""
         return f"> {icon_str} {text}".strip()
 
     def convert_divider(self, block: Dict) -> str:
@@ -197,10 +312,13 @@ class MarkdownConverter:
         Returns:
             List of cell contents as strings
         """
-        table_row = block.get("table_row", {})
-        cells = table_row.get("cells", [])
+        try:
+            cells = block["table_row"]["cells"]
+        except KeyError:
+            return []
 
-        return [self.convert_rich_text(cell) for cell in cells]
+        convert_rich_text = self.convert_rich_text
+        return [convert_rich_text(cell) for cell in cells]
 
     def convert_table(self, block: Dict, rows: List[Dict]) -> str:
         """
@@ -216,43 +334,49 @@ class MarkdownConverter:
         if not rows:
             return ""
 
-        table = block.get("table", {})
+        table = block.get("table", _EMPTY_DICT)
         has_column_header = table.get("has_column_header", False)
         has_row_header = table.get("has_row_header", False)
 
         # Convert all rows
-        all_rows = [self.convert_table_row(row) for row in rows]
+        convert_table_row = self.convert_table_row
+        all_rows = [convert_table_row(row) for row in rows]
 
         if not all_rows:
             return ""
 
         # Determine column count
-        col_count = max(len(row) for row in all_rows)
-
-        # Pad rows to have same column count
-        for row in all_rows:
-            while len(row) < col_count:
-                row.append("")
+        col_count = max(map(len, all_rows))
 
-        result = []
+        separator = _table_separator(col_count)
 
         # If first row is header, format it specially
-        if has_column_header and all_rows:
-            header = all_rows[0]
-            result.append("| " + " | ".join(header) + " |")
-            result.append("|" + "|".join(["---"] * col_count) + "|")
-            data_rows = all_rows[1:]
+        if has_column_header:
+            parts = []
         else:
             # No header, add empty header
-            result.append("| " + " | ".join([f"Column {i+1}" for i in range(col_count)]) + " |")
-            result.append("|" + "|".join(["---"] * col_count) + "|")
-            data_rows = all_rows
+            parts = [_default_table_header(col_count), separator]
 
-        # Add data rows
-        for row in data_rows:
-            result.append("| " + " | ".join(row) + " |")
+        # Collect every line's pieces and join once. Short rows are padded
+        # with empty cells in the line's ending rather than in the row list
+        for row in all_rows:
+            if not row:
+                row = [""]
+            missing = col_count - len(row)
+            parts.extend((
+                "| ",
+                " | ".join(row),
+                " |" + "  |" * missing + "\n" if missing else " |\n"
+            ))
+
+        if has_column_header:
+            # The separator goes after the header row's three parts
+            parts.insert(3, separator)
 
-        return "\n".join(result)
+        # No newline after the last line
+        parts[-1] = parts[-1][:-1]
+
+        return "".join(parts)
 
     def convert_block(self, block: Dict, list_counter: Optional[Dict[str, int]] = None) -> Tuple[str, bool]:
         """
@@ -265,28 +389,19 @@ class MarkdownConverter:
         Returns:
             Tuple of (markdown_string, is_supported)
         """
-        if list_counter is None:
-            list_counter = {}
-
         block_type = block.get("type")
-        block_id = block.get("id", "unknown")
-
-        if block_type == "paragraph":
-            return self.convert_paragraph(block), True
-
-        elif block_type == "heading_1":
-            return self.convert_heading(block, 1), True
 
-        elif block_type == "heading_2":
-            return self.convert_heading(block, 2), True
+        # Block types that are always supported and need no extra state
+        convert = self._simple_converters.get(block_type)
+        if convert is not None:
+            return convert(block), True
 
-        elif block_type == "heading_3":
-            return self.convert_heading(block, 3), True
+        block_id = block.get("id", "unknown")
 
-        elif block_type == "bulleted_list_item":
-            return self.convert_bulleted_list_item(block), True
+        if block_type == "numbered_list_item":
+            if list_counter is None:
+                list_counter = {}
 
-        elif block_type == "numbered_list_item":
             # Track list position
             if "numbered" not in list_counter:
                 list_counter["numbered"] = 1
@@ -296,55 +411,18 @@ class MarkdownConverter:
             md = self.convert_numbered_list_item(block, list_counter["numbered"])
             return md, True
 
-        elif block_type == "to_do":
-            return self.convert_to_do(block), True
-
-        elif block_type == "toggle":
-            return self.convert_toggle(block), True
-
-        elif block_type == "code":
-            return self.convert_code(block), True
-
-        elif block_type == "quote":
-            return self.convert_quote(block), True
-
-        elif block_type == "callout":
-            return self.convert_callout(block), True
-
-        elif block_type == "divider":
-            return self.convert_divider(block), True
-
-        elif block_type == "child_page":
-            # Child pages are handled separately in hierarchy
-            return "", True
-
         elif block_type == "child_database":
             # Child databases are handled separately
             if self.track_skipped_databases:
                 self.add_unsupported("child_database", "not_exported", block_id)
             return "", True
 
-        elif block_type == "table":
-            # Tables need their row children, will be handled specially
-            return "", True
-
-        elif block_type == "table_row":
-            # Table rows are handled as part of table
-            return "", True
-
         elif block_type == "image":
             # Handle images
-            image = block.get("image", {})
-            image_type = image.get("type")
-
-            if image_type == "external":
-                url = image.get("external", {}).get("url", "")
-            elif image_type == "file":
-                url = image.get("file", {}).get("url", "")
-            else:
-                url = ""
+            image = block.get("image", _EMPTY_DICT)
+            url = _file_url(image)
 
-            caption = image.get("caption", [])
+            caption = image.get("caption", _EMPTY_LIST)
             caption_text = self.convert_rich_text(caption) if caption else "image"
 
             if url:
@@ -355,17 +433,10 @@ class MarkdownConverter:
 
         elif block_type == "file":
             # Handle file attachments
-            file = block.get("file", {})
-            file_type = file.get("type")
-
-            if file_type == "external":
-                url = file.get("external", {}).get("url", "")
-            elif file_type == "file":
-                url = file.get("file", {}).get("url", "")
-            else:
-                url = ""
+            file = block.get("file", _EMPTY_DICT)
+            url = _file_url(file)
 
-            caption = file.get("caption", [])
+            caption = file.get("caption", _EMPTY_LIST)
             caption_text = self.convert_rich_text(caption) if caption else "file"
 
             if url:
@@ -374,9 +445,9 @@ class MarkdownConverter:
                 return f"[File: {caption_text}]", False
 
         elif block_type == "bookmark":
-            bookmark = block.get("bookmark", {})
+            bookmark = block.get("bookmark", _EMPTY_DICT)
             url = bookmark.get("url", "")
-            caption = bookmark.get("caption", [])
+            caption = bookmark.get("caption", _EMPTY_LIST)
             caption_text = self.convert_rich_text(caption) if caption else url
 
             if url:
@@ -385,8 +456,7 @@ class MarkdownConverter:
                 return "[Bookmark]", False
 
         elif block_type == "equation":
-            equation = block.get("equation", {})
-            expression = equation.get("expression", "")
+            expression = block.get("equation", _EMPTY_DICT).get("expression", "")
             return f"$$\n{expression}\n$$", True
 
         elif block_type == "unsupported":
@@ -408,48 +478,75 @@ class MarkdownConverter:
         Returns:
             Markdown string
         """
-        result = []
-        list_counter = {}
+        parts: List[str] = []
+        self.convert_blocks_to_stream(blocks, parts.append)
+        return "".join(parts)
+
+    def convert_blocks_to_stream(
+        self,
+        blocks: List[Dict],
+        write: Callable[[str], Any]
+    ) -> None:
+        """
+        Convert a list of Notion blocks to Markdown, emitting it piecewise.
+
+        Each block's markdown is passed to write as soon as it is converted,
+        so the whole document never has to be held in memory (e.g. when
+        write is a file's write method).
+
+        Args:
+            blocks: List of Notion block objects
+            write: Function called with successive pieces of the output
+        """
+        # Position in the current numbered list, 0 outside of one
+        numbered = 0
+        first = True
+
+        # Look up every block's type once, for both dispatch and table scans
+        types = [block.get("type") for block in blocks]
+        block_count = len(blocks)
 
         i = 0
-        while i < len(blocks):
+        while i < block_count:
             block = blocks[i]
-            block_type = block.get("type")
+            block_type = types[i]
 
             # Handle tables specially (need to collect rows)
             if block_type == "table":
-                table_block = block
-                rows = []
-
                 # Collect following table_row blocks
                 j = i + 1
-                while j < len(blocks) and blocks[j].get("type") == "table_row":
-                    rows.append(blocks[j])
+                while j < block_count and types[j] == "table_row":
                     j += 1
 
-                md = self.convert_table(table_block, rows)
+                md = self.convert_table(block, blocks[i + 1:j])
                 if md:
-                    result.append(md)
+                    if not first:
+                        write("\n\n")
+                    write(md)
+                    first = False
 
                 i = j  # Skip the rows we just processed
-                list_counter = {}  # Reset list counter after table
+                numbered = 0  # Reset list counter after table
                 continue
 
-            # Reset numbered list counter if we're not in a numbered list
-            if block_type != "numbered_list_item":
-                list_counter.pop("numbered", None)
-
-            # Convert block
-            md, is_supported = self.convert_block(block, list_counter)
+            # Convert block, numbering list items here rather than
+            # threading a counter dict through convert_block
+            if block_type == "numbered_list_item":
+                numbered += 1
+                md = self.convert_numbered_list_item(block, numbered)
+            else:
+                # Reset numbered list counter, we're not in a numbered list
+                numbered = 0
+                md, is_supported = self.convert_block(block)
 
             if md:
-                result.append(md)
+                if not first:
+                    write("\n\n")
+                write(md)
+                first = False
 
             i += 1
 
-        return "\n\n".join(result)
-
-
 if __name__ == '__main__':
     """Test the markdown converter."""
     # Example test blocks
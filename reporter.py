@@ -5,13 +5,55 @@ This module collects information about features that couldn't be exported
 and generates a comprehensive report for manual review.
 """
 
-from typing import List, Dict, Set
+from itertools import groupby
+from typing import Dict, Iterator, List, Set
 from pathlib import Path
-from collections import defaultdict
 from markdown_converter import UnsupportedFeature
 from hierarchy import PageNode
 
 
+# Static guidance appended to every report with unsupported features
+_RECOMMENDATIONS = """### How to Handle Unsupported Features
+
+Notion has many rich features that don't have direct Markdown equivalents. Here's how to handle them:
+
+#### Unsupported Block Types
+
+- **Databases (advanced views)**: Databases are exported as simple Markdown tables. Board, calendar, gallery, and timeline views cannot be represented in Markdown. Consider exporting these separately from the Notion UI.
+
+- **Embedded Content**: Videos, maps, and other embedded content appear as links. Download these manually if needed.
+
+- **Synced Blocks**: Content from synced blocks is duplicated in each location. You may want to manually deduplicate this content.
+
+- **Equations**: LaTeX equations are preserved with `$equation$` or `$$equation$$` syntax. Ensure your Markdown renderer supports LaTeX.
+
+#### Rich Formatting
+
+- **Colors and Highlights**: Text colors and background highlights are not supported in standard Markdown and are lost during export.
+
+- **Page Icons and Covers**: These are not exported. Consider adding them manually if they're important.
+
+- **Comments**: Comments and discussions are not included in the export. Review important comments in Notion before exporting.
+
+#### Mentions
+
+- **User Mentions**: Converted to `@username` format
+- **Page Links**: Converted to plain text page names
+- **Date Mentions**: Converted to plain text dates
+
+#### What to Do
+
+1. Review the blocks listed above in your original Notion pages
+2. Manually export or copy content that's critical
+3. For databases, consider using Notion's CSV export for data preservation
+4. Test your Markdown files in your target renderer (e.g., static site generator)
+
+### Need More Features?
+
+If you need better support for specific block types, please open an issue on the project repository.
+"""
+
+
 class ExportReport:
     """Generates reports about the export process."""
 
@@ -43,151 +85,107 @@ class ExportReport:
         Returns:
             Markdown formatted report
         """
-        if not self.unsupported_features:
-            return self._generate_success_report()
+        return "".join(self._iter_report_lines())
 
-        # Group features by type
-        by_type = defaultdict(list)
-        for feature in self.unsupported_features:
-            key = f"{feature.block_type}.{feature.feature}"
-            by_type[key].append(feature)
+    def _iter_report_lines(self) -> Iterator[str]:
+        """
+        Generate the report one line at a time.
+
+        Every line but the last ends with a newline, so the lines can be
+        written out as they are produced.
+
+        Yields:
+            Lines of the markdown report
+        """
+        if not self.unsupported_features:
+            yield from self._iter_success_report_lines()
+            return
+
+        # Group block IDs by feature type in one pass over the sorted
+        # features; the sort is stable, so block IDs keep their order
+        def feature_type_of(feature: UnsupportedFeature) -> str:
+            return f"{feature.block_type}.{feature.feature}"
+
+        by_type = [
+            (feature_type, [feature.block_id for feature in group])
+            for feature_type, group in groupby(
+                sorted(self.unsupported_features, key=feature_type_of),
+                key=feature_type_of
+            )
+        ]
 
         # Check if there are databases
-        database_count = len(by_type.get("child_database.not_exported", []))
+        database_count = 0
+        for feature_type, block_ids in by_type:
+            if feature_type == "child_database.not_exported":
+                database_count = len(block_ids)
 
         # Generate report
-        lines = [
-            "# Export Report",
-            "",
-            "This report lists Notion features that could not be fully exported to Markdown.",
-            "",
-            f"**Total unsupported features:** {len(self.unsupported_features)}",
-            "",
-        ]
+        yield "# Export Report\n"
+        yield "\n"
+        yield "This report lists Notion features that could not be fully exported to Markdown.\n"
+        yield "\n"
+        yield f"**Total unsupported features:** {len(self.unsupported_features)}\n"
+        yield "\n"
 
         # Special section for databases
         if database_count > 0:
-            lines.extend([
-                "## Databases Not Exported",
-                "",
-                f"**{database_count} database(s)** were found but not exported.",
-                "",
-                "Databases can be exported using the `--include-databases` flag:",
-                "```",
-                "python3 main.py --include-databases",
-                "```",
-                "",
-            ])
-
-        lines.extend([
-            "---",
-            "",
-        ])
+            yield "## Databases Not Exported\n"
+            yield "\n"
+            yield f"**{database_count} database(s)** were found but not exported.\n"
+            yield "\n"
+            yield "Databases can be exported using the `--include-databases` flag:\n"
+            yield "```\n"
+            yield "python3 main.py --include-databases\n"
+            yield "```\n"
+            yield "\n"
+
+        yield "---\n"
+        yield "\n"
 
         # Summary section
-        lines.extend([
-            "## Summary by Feature Type",
-            "",
-        ])
+        yield "## Summary by Feature Type\n"
+        yield "\n"
 
-        for feature_type in sorted(by_type.keys()):
-            count = len(by_type[feature_type])
-            lines.append(f"- **{feature_type}**: {count} occurrence(s)")
+        for feature_type, block_ids in by_type:
+            yield f"- **{feature_type}**: {len(block_ids)} occurrence(s)\n"
 
-        lines.extend(["", "---", ""])
+        yield "\n"
+        yield "---\n"
+        yield "\n"
 
         # Detailed section
-        lines.extend([
-            "## Detailed Breakdown",
-            "",
-        ])
-
-        for feature_type in sorted(by_type.keys()):
-            features = by_type[feature_type]
-            lines.extend([
-                f"### {feature_type}",
-                "",
-                f"**Occurrences:** {len(features)}",
-                "",
-            ])
-
-            # Group by page
-            by_page = defaultdict(list)
-            for feature in features:
-                # Try to find page title
-                # Note: block_id might not be a page_id, it's the block's own ID
-                by_page["Unknown Page"].append(feature.block_id)
-
-            for page, block_ids in by_page.items():
-                lines.append(f"**{page}:**")
-                for block_id in block_ids[:5]:  # Limit to first 5
-                    lines.append(f"- Block ID: `{block_id}`")
-                if len(block_ids) > 5:
-                    lines.append(f"- ... and {len(block_ids) - 5} more")
-                lines.append("")
+        yield "## Detailed Breakdown\n"
+        yield "\n"
+
+        for feature_type, block_ids in by_type:
+            yield f"### {feature_type}\n"
+            yield "\n"
+            yield f"**Occurrences:** {len(block_ids)}\n"
+            yield "\n"
+            # Block IDs aren't page IDs, so the page is unknown
+            yield "**Unknown Page:**\n"
+
+            for block_id in block_ids[:5]:  # Limit to first 5
+                yield f"- Block ID: `{block_id}`\n"
+            if len(block_ids) > 5:
+                yield f"- ... and {len(block_ids) - 5} more\n"
+            yield "\n"
 
         # Recommendations section
-        lines.extend([
-            "---",
-            "",
-            "## Recommendations",
-            "",
-            self._get_recommendations(),
-        ])
-
-        return "\n".join(lines)
-
-    def _generate_success_report(self) -> str:
-        """Generate a report when everything was exported successfully."""
-        return "\n".join([
-            "# Export Report",
-            "",
-            "All pages were exported successfully!",
-            "",
-            "No unsupported features were encountered during the export process.",
-        ])
-
-    def _get_recommendations(self) -> str:
-        """Get recommendations for handling unsupported features."""
-        return """### How to Handle Unsupported Features
-
-Notion has many rich features that don't have direct Markdown equivalents. Here's how to handle them:
-
-#### Unsupported Block Types
-
-- **Databases (advanced views)**: Databases are exported as simple Markdown tables. Board, calendar, gallery, and timeline views cannot be represented in Markdown. Consider exporting these separately from the Notion UI.
-
-- **Embedded Content**: Videos, maps, and other embedded content appear as links. Download these manually if needed.
-
-- **Synced Blocks**: Content from synced blocks is duplicated in each location. You may want to manually deduplicate this content.
-
-- **Equations**: LaTeX equations are preserved with `$equation$` or `$$equation$$` syntax. Ensure your Markdown renderer supports LaTeX.
-
-#### Rich Formatting
-
-- **Colors and Highlights**: Text colors and background highlights are not supported in standard Markdown and are lost during export.
-
-- **Page Icons and Covers**: These are not exported. Consider adding them manually if they're important.
-
-- **Comments**: Comments and discussions are not included in the export. Review important comments in Notion before exporting.
-
-#### Mentions
-
-- **User Mentions**: Converted to `@username` format
-- **Page Links**: Converted to plain text page names
-- **Date Mentions**: Converted to plain text dates
-
-#### What to Do
-
-1. Review the blocks listed above in your original Notion pages
-2. Manually export or copy content that's critical
-3. For databases, consider using Notion's CSV export for data preservation
-4. Test your Markdown files in your target renderer (e.g., static site generator)
-
-### Need More Features?
-
-If you need better support for specific block types, please open an issue on the project repository.
-"""
+        yield "---\n"
+        yield "\n"
+        yield "## Recommendations\n"
+        yield "\n"
+        yield _RECOMMENDATIONS
+
+    def _iter_success_report_lines(self) -> Iterator[str]:
+        """Generate the success report one line at a time."""
+        yield "# Export Report\n"
+        yield "\n"
+        yield "All pages were exported successfully!\n"
+        yield "\n"
+        yield "No unsupported features were encountered during the export process."
 
     def save_report(self, output_path: Path) -> bool:
         """
@@ -200,10 +198,8 @@ If you need better support for specific block types, please open an issue on the
             True if successful, False otherwise
         """
         try:
-            report = self.generate_report()
-
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(report)
+                f.writelines(self._iter_report_lines())
 
             return True
         except Exception as e: